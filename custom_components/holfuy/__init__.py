@@ -1,10 +1,14 @@
 import logging
 import asyncio
+import hashlib
+import time
+from contextlib import nullcontext
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import TimestampDataUpdateCoordinator, UpdateFailed
 import aiohttp
 import async_timeout
 
@@ -17,8 +21,39 @@ from .const import (
     CONF_TEMP_UNIT,
     DEFAULT_WIND_UNIT,
     DEFAULT_TEMP_UNIT,
+    CONF_ENABLE_METRICS,
+    CONF_RECORD_TRAFFIC,
+    CONF_VIRTUAL_STATION,
+    CONF_VIRTUAL_LATITUDE,
+    CONF_VIRTUAL_LONGITUDE,
+    CONF_VIRTUAL_MEMBERS,
+    CONF_REFRESH_TTL,
+    DEFAULT_REFRESH_TTL,
+    CONF_EXPORT_FORMAT,
+    DEFAULT_EXPORT_FORMAT,
+    CONF_WIND_ROSE_WINDOWS,
+    DEFAULT_WIND_ROSE_WINDOWS,
 )
 from . import repairs
+from .exceptions import (
+    HolfuyError,
+    HolfuyAuthError,
+    HolfuyInvalidResponseError,
+    HolfuyHttpError,
+    HolfuyConnectionError,
+    HolfuyTimeoutError,
+)
+from .profiler import CycleProfiler, stage
+from .services import async_setup_services, async_unload_services
+from .catalog import RETRY_AFTER_FAILURE, async_get_catalog
+from .refresh import RefreshGate
+from .history import HistoryStore
+from .export import EXPORT_NONE, ReadingExporter
+from .windrose import WindRoseStore, parse_windows
+from .websocket import async_setup_websocket
+from .virtual import VirtualStation
+from .traffic import TrafficRecorder, RecordingSession, RECORDING_DIR
+from .metrics import HolfuyMetrics, PATH_COMBINED, PATH_FALLBACK
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,33 +62,112 @@ DEFAULT_UPDATE_INTERVAL = timedelta(minutes=2)
 MAX_UPDATE_INTERVAL = timedelta(minutes=10)
 MIN_UPDATE_INTERVAL = timedelta(minutes=1)
 
+# Polls on the per-station fallback path before the combined request is tried again
+COMBINED_RETRY_POLLS = 30
+
+# Returned by _fetch_json when the server or body hash reports no change since the last poll
+NOT_MODIFIED = object()
 
-async def _fetch_json(session: aiohttp.ClientSession, url: str):
+
+async def _fetch_json(
+    session: aiohttp.ClientSession,
+    url: str,
+    metrics: HolfuyMetrics | None = None,
+    station: str | None = None,
+    profiler: CycleProfiler | None = None,
+    validators: dict | None = None,
+):
     """Fetch JSON from URL with error handling.
-    
-    Returns the JSON data on success, or raises UpdateFailed with error type encoded in message.
-    Error message format: "error message|||error_type"
+
+    Returns the JSON data on success, or raises a HolfuyError subclass carrying the
+    HTTP status, station and request latency.
+
+    When a validators dict is given, the request is made conditional on the previous
+    response for the same URL (ETag / Last-Modified, falling back to a body hash) and
+    NOT_MODIFIED is returned instead of decoding an unchanged body.
     """
+    start = time.monotonic()
+    nbytes = 0
+    decoded = 0
+    error = None
+    not_modified = False
+    # aiohttp already negotiates compression (gzip, deflate and br when available)
+    headers = {}
+    cached = validators.get(url) if validators is not None else None
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
     try:
         async with async_timeout.timeout(10):
-            async with session.get(url) as resp:
+            with stage(profiler, "fetch"):
+                resp = await session.get(url, headers=headers)
+            async with resp:
+                if resp.status == 304 and cached is not None:
+                    not_modified = True
+                    return NOT_MODIFIED
+
                 # Check for authentication errors
                 if resp.status in (401, 403):
-                    raise UpdateFailed(f"Authentication error {resp.status}: {resp.reason}|||auth")
-                
+                    error = HolfuyAuthError(
+                        f"Authentication error {resp.status}: {resp.reason}", status=resp.status, station=station
+                    )
+                    raise error
+
                 resp.raise_for_status()  # Raise exception for HTTP errors
-                
-                return await resp.json()
-    except aiohttp.ContentTypeError as err:
-        raise UpdateFailed(f"Invalid JSON response: {err}|||invalid_response")
+
+                with stage(profiler, "fetch"):
+                    body = await resp.read()
+                decoded = len(body)
+                # Content-Length is the size on the wire; chunked responses only have the decoded size
+                nbytes = resp.content_length if resp.content_length is not None else decoded
+
+                if validators is not None:
+                    digest = hashlib.blake2b(body, digest_size=16).digest()
+                    if cached is not None and cached["hash"] == digest:
+                        not_modified = True
+                        return NOT_MODIFIED
+
+                # Body is already buffered, so this only measures decoding
+                with stage(profiler, "json_decode"):
+                    data = await resp.json()
+
+                # Only remember validators for bodies that decoded successfully
+                if validators is not None:
+                    validators[url] = {
+                        "etag": resp.headers.get("ETag"),
+                        "last_modified": resp.headers.get("Last-Modified"),
+                        "hash": digest,
+                    }
+                return data
+    except HolfuyError:
+        raise
+    except (aiohttp.ContentTypeError, ValueError) as err:
+        error = HolfuyInvalidResponseError(
+            f"Invalid JSON response: {err}", status=getattr(err, "status", None), station=station
+        )
+        raise error from err
     except aiohttp.ClientResponseError as err:
-        raise UpdateFailed(f"HTTP error {err.status}: {err.message}|||http_error")
+        error = HolfuyHttpError(f"HTTP error {err.status}: {err.message}", status=err.status, station=station)
+        raise error from err
     except aiohttp.ClientError as err:
-        raise UpdateFailed(f"Connection error: {err}|||connection")
-    except asyncio.TimeoutError:
-        raise UpdateFailed("Request timeout|||timeout")
+        error = HolfuyConnectionError(f"Connection error: {err}", station=station)
+        raise error from err
+    except asyncio.TimeoutError as err:
+        error = HolfuyTimeoutError("Request timeout", station=station)
+        raise error from err
     except Exception as err:
-        raise UpdateFailed(f"Request failed: {err}|||unknown")
+        error = HolfuyError(f"Request failed: {err}", station=station)
+        raise error from err
+    finally:
+        elapsed = time.monotonic() - start
+        if error is not None:
+            error.latency = elapsed
+        if metrics is not None:
+            metrics.record_request(
+                elapsed, nbytes, error.error_type if error is not None else None, not_modified, decoded
+            )
 
 
 def _build_url(api_key: str, stations: list[str], tu: str, su: str, station=None):
@@ -119,163 +233,308 @@ def _parse_combined_response(response, stations: list[str]) -> dict | None:
     return None
 
 
-def _make_update_method(api_key: str, stations: list[str], tu: str, su: str, coordinator, hass: HomeAssistant, entry_id: str):
-    """Create the update method with error tracking for throttling and repair issues."""
+def _make_update_method(
+    api_key: str,
+    stations: list[str],
+    tu: str,
+    su: str,
+    coordinator,
+    hass: HomeAssistant,
+    entry_id: str,
+    metrics: HolfuyMetrics | None = None,
+    recorder: TrafficRecorder | None = None,
+    virtual: VirtualStation | None = None,
+    replay: bool = False,
+):
+    """Create the update method with error tracking for throttling and repair issues.
+
+    The returned method accepts an optional session, used by replay to substitute
+    recorded traffic for aiohttp. Replays use their own instance (replay=True), which
+    keeps separate error and validator state and never touches repair issues, the
+    update interval or the profiler.
+
+    Unchanged polls reuse the instance's own last result rather than coordinator.data,
+    which may hold replayed readings.
+    """
     consecutive_errors = 0
     station_error_counts = {station: 0 for station in stations}
     last_error_type = None
-
-    async def async_update_data():
+    last_path = None
+    fallback_polls = 0
+    last_data: dict | None = None
+    # url -> {"etag", "last_modified", "hash"} of the last successfully decoded response
+    validators = {}
+    trace_configs = [metrics.trace_config()] if metrics is not None else None
+
+    def _active_profiler() -> CycleProfiler | None:
+        if replay:
+            return None
+        profiler = hass.data.get(DOMAIN, {}).get(entry_id, {}).get("profiler")
+        return profiler if profiler is not None and profiler.active else None
+
+    def _add_virtual(data: dict) -> dict:
+        # Interpolated once per update from the members' fresh readings
+        if virtual is None:
+            return data
+        value = virtual.compute(data)
+        if data is last_data:
+            # Unchanged poll: only hand out a new mapping if the virtual reading moved (e.g. went stale)
+            if data.get(virtual.station_id) == value:
+                return data
+            data = dict(data)
+        data[virtual.station_id] = value
+        return data
+
+    def _open_session(session):
+        if session is not None:
+            return nullcontext(session)
+        client = aiohttp.ClientSession(trace_configs=trace_configs)
+        if recorder is not None:
+            return RecordingSession(client, recorder)
+        return client
+
+    inflight: asyncio.Task | None = None
+
+    def _clear_inflight(task: asyncio.Task) -> None:
+        nonlocal inflight
+        if inflight is task:
+            inflight = None
+
+    async def async_update_data(session=None):
+        nonlocal inflight
+        # Replays bring their own session and never join a live poll
+        if session is not None:
+            return await _async_run_cycle(session)
+        # Single flight: concurrent refreshes share the poll already in progress
+        if inflight is None:
+            inflight = hass.async_create_task(_async_run_cycle(None))
+            inflight.add_done_callback(_clear_inflight)
+        return await asyncio.shield(inflight)
+
+    async def _async_run_cycle(session):
+        nonlocal last_data
+        profiler = _active_profiler()
+        if metrics is None and profiler is None:
+            last_data = _add_virtual(await _async_update_data(session, None))
+            return last_data
+
+        success = False
+        try:
+            if metrics is not None:
+                metrics.start_cycle()
+            if profiler is not None:
+                profiler.start_cycle()
+            last_data = _add_virtual(await _async_update_data(session, profiler))
+            success = True
+            return last_data
+        finally:
+            if metrics is not None:
+                metrics.end_cycle(success)
+            if profiler is not None:
+                profiler.end_cycle(success)
+
+    async def _async_mark_unchanged(profiler: CycleProfiler | None) -> dict:
+        """Treat an unchanged poll as a success and return the current data untouched."""
         nonlocal consecutive_errors, last_error_type
+        consecutive_errors = 0
+        last_error_type = None
+        if not replay and coordinator.update_interval != DEFAULT_UPDATE_INTERVAL:
+            coordinator.update_interval = DEFAULT_UPDATE_INTERVAL
+            _LOGGER.info("API calls successful, restored normal update interval")
+        if not replay and not coordinator.last_update_success:
+            with stage(profiler, "repairs"):
+                await repairs.async_delete_auth_failure_issue(hass, entry_id)
+                await repairs.async_delete_api_connection_failure_issue(hass, entry_id)
+                await repairs.async_delete_invalid_response_issue(hass, entry_id)
+        return last_data
+
+    async def _async_update_data(session, profiler: CycleProfiler | None):
+        nonlocal consecutive_errors, last_error_type, last_path, fallback_polls
+
+        # Conditional requests need data from a previous poll to fall back on; the first
+        # poll starts from empty validators and stores them for the next one
+        if not last_data:
+            validators.clear()
+
+        # Single-station entries always end up on the per-station request (same URL), and once
+        # on the fallback path the combined request is only retried every COMBINED_RETRY_POLLS
+        use_combined = len(stations) > 1 and (
+            last_path != PATH_FALLBACK or fallback_polls >= COMBINED_RETRY_POLLS
+        )
 
         try:
-            # Try one combined request first
-            async with aiohttp.ClientSession() as session:
-                combined_url = _build_url(api_key, stations, tu, su, station=None)
-                try:
-                    response = await _fetch_json(session, combined_url)
-                except UpdateFailed as err:
-                    # Parse error type from message if present
-                    error_str = str(err)
-                    if "|||" in error_str:
-                        error_msg, error_type = error_str.split("|||", 1)
-                        
-                        # Create appropriate repair issues
-                        if error_type == "auth":
-                            await repairs.async_create_auth_failure_issue(hass, entry_id)
-                            raise UpdateFailed(error_msg)
-                        elif error_type == "invalid_response":
-                            await repairs.async_create_invalid_response_issue(hass, entry_id)
-                            raise UpdateFailed(error_msg)
+            # Try one combined request first (see use_combined)
+            async with _open_session(session) as client:
+                if use_combined:
+                    with stage(profiler, "url_build"):
+                        combined_url = _build_url(api_key, stations, tu, su, station=None)
+                    try:
+                        response = await _fetch_json(
+                            client,
+                            combined_url,
+                            metrics,
+                            profiler=profiler,
+                            validators=validators if last_path != PATH_FALLBACK else None,
+                        )
+                    except HolfuyAuthError:
+                        if not replay:
+                            with stage(profiler, "repairs"):
+                                await repairs.async_create_auth_failure_issue(hass, entry_id)
+                        raise
+                    except HolfuyInvalidResponseError:
+                        if not replay:
+                            with stage(profiler, "repairs"):
+                                await repairs.async_create_invalid_response_issue(hass, entry_id)
+                        raise
+                    except HolfuyError as err:
+                        # Not a success with no data: the per-station requests decide the outcome
+                        _LOGGER.debug("Combined request failed, falling back to per-station requests: %s", err)
+                        response = None
+
+                    if response is NOT_MODIFIED:
+                        # Same payload as the last combined poll: skip parsing and entity updates
+                        if metrics is not None:
+                            metrics.set_path(PATH_COMBINED)
+                        return await _async_mark_unchanged(profiler)
+
+                    with stage(profiler, "parse"):
+                        parsed = _parse_combined_response(response, stations) if response is not None else None
+                    if parsed is not None:
+                        # Successful combined response parsed into mapping station -> data
+                        if metrics is not None:
+                            metrics.set_path(PATH_COMBINED)
+                        last_path = PATH_COMBINED
+                        consecutive_errors = 0
+                        last_error_type = None
                     
-                    _LOGGER.debug("Combined request failed: %s", err)
-                    response = None
-
-                parsed = _parse_combined_response(response, stations)
-                if parsed is not None:
-                    # Successful combined response parsed into mapping station -> data
-                    consecutive_errors = 0
-                    last_error_type = None
+                        # Reset station error counts
+                        for station in stations:
+                            station_error_counts[station] = 0
                     
-                    # Reset station error counts
-                    for station in stations:
-                        station_error_counts[station] = 0
+                        # Restore normal update interval on success
+                        if not replay and coordinator.update_interval != DEFAULT_UPDATE_INTERVAL:
+                            coordinator.update_interval = DEFAULT_UPDATE_INTERVAL
+                            _LOGGER.info("API calls successful, restored normal update interval")
                     
-                    # Restore normal update interval on success
-                    if coordinator.update_interval != DEFAULT_UPDATE_INTERVAL:
-                        coordinator.update_interval = DEFAULT_UPDATE_INTERVAL
-                        _LOGGER.info("API calls successful, restored normal update interval")
-                    
-                    # Dismiss all repair issues on success
-                    await repairs.async_delete_auth_failure_issue(hass, entry_id)
-                    await repairs.async_delete_api_connection_failure_issue(hass, entry_id)
-                    await repairs.async_delete_invalid_response_issue(hass, entry_id)
-                    for station in stations:
-                        await repairs.async_delete_station_inaccessible_issue(hass, entry_id, station)
+                        # Dismiss all repair issues on success
+                        if not replay:
+                            with stage(profiler, "repairs"):
+                                await repairs.async_delete_auth_failure_issue(hass, entry_id)
+                                await repairs.async_delete_api_connection_failure_issue(hass, entry_id)
+                                await repairs.async_delete_invalid_response_issue(hass, entry_id)
+                                for station in stations:
+                                    await repairs.async_delete_station_inaccessible_issue(hass, entry_id, station)
                     
-                    return parsed
+                        return parsed
 
                 # Fallback: if combined response couldn't be broken down, issue parallel requests per station
+                if metrics is not None:
+                    metrics.set_path(PATH_FALLBACK)
+                last_path = PATH_FALLBACK
+                fallback_polls = 0 if use_combined else fallback_polls + 1
                 tasks = []
+                urls = {}
                 for station in stations:
-                    url = _build_url(api_key, stations, tu, su, station=station)
-                    tasks.append(_fetch_json(session, url))
+                    with stage(profiler, "url_build"):
+                        urls[station] = _build_url(api_key, stations, tu, su, station=station)
+                    tasks.append(_fetch_json(client, urls[station], metrics, station, profiler, validators))
                 results = await asyncio.gather(*tasks, return_exceptions=True)
 
+                if all(res is NOT_MODIFIED for res in results):
+                    return await _async_mark_unchanged(profiler)
+
                 # Map results to station ids
                 mapping = {}
-                has_errors = False
+                first_error = None
                 auth_error = False
                 invalid_response = False
-                
+
                 for station, res in zip(stations, results):
                     if isinstance(res, Exception):
                         _LOGGER.warning("Error fetching data for station %s: %s", station, res)
-                        has_errors = True
-                        
+                        if first_error is None:
+                            first_error = res
+
                         # Track station-specific errors
                         station_error_counts[station] += 1
-                        
-                        # Parse error type if present
-                        error_str = str(res)
-                        if "|||" in error_str:
-                            error_msg, error_type = error_str.split("|||", 1)
-                            
-                            if error_type == "auth":
-                                auth_error = True
-                            elif error_type == "invalid_response":
-                                invalid_response = True
-                        
+
+                        if isinstance(res, HolfuyAuthError):
+                            auth_error = True
+                        elif isinstance(res, HolfuyInvalidResponseError):
+                            invalid_response = True
+
                         # Create repair issue for station if errors persist
-                        if station_error_counts[station] >= 3:
-                            await repairs.async_create_station_inaccessible_issue(hass, entry_id, station)
+                        if not replay and station_error_counts[station] >= 3:
+                            with stage(profiler, "repairs"):
+                                await repairs.async_create_station_inaccessible_issue(hass, entry_id, station)
                         
                         continue
                     
+                    if res is NOT_MODIFIED:
+                        res = last_data.get(str(station))
+                        if res is None:
+                            # Nothing to reuse; fetch the full body next poll
+                            validators.pop(urls[station], None)
+                            continue
+
                     # Success - store the data
                     mapping[str(station)] = res
                     # Clear station error count on success
                     station_error_counts[station] = 0
                     # Dismiss station issue if it exists
-                    await repairs.async_delete_station_inaccessible_issue(hass, entry_id, station)
+                    if not replay:
+                        with stage(profiler, "repairs"):
+                            await repairs.async_delete_station_inaccessible_issue(hass, entry_id, station)
 
                 # Handle authentication errors
                 if auth_error:
-                    await repairs.async_create_auth_failure_issue(hass, entry_id)
+                    if not replay:
+                        with stage(profiler, "repairs"):
+                            await repairs.async_create_auth_failure_issue(hass, entry_id)
                     # Don't fail completely if we have partial data from other stations
                     if not mapping:
-                        raise UpdateFailed("Authentication failed for all stations")
+                        raise HolfuyAuthError("Authentication failed for all stations")
                 
                 # Handle invalid response errors
                 if invalid_response:
-                    await repairs.async_create_invalid_response_issue(hass, entry_id)
+                    if not replay:
+                        with stage(profiler, "repairs"):
+                            await repairs.async_create_invalid_response_issue(hass, entry_id)
                     # Don't fail completely if we have partial data from other stations
                     if not mapping:
-                        raise UpdateFailed("Invalid response format for all stations")
+                        raise HolfuyInvalidResponseError("Invalid response format for all stations")
 
                 # If we got at least some data, reset error counter
                 if mapping:
                     consecutive_errors = 0
                     last_error_type = None
                     
-                    if coordinator.update_interval != DEFAULT_UPDATE_INTERVAL:
+                    if not replay and coordinator.update_interval != DEFAULT_UPDATE_INTERVAL:
                         coordinator.update_interval = DEFAULT_UPDATE_INTERVAL
                         _LOGGER.info("API calls successful, restored normal update interval")
                     
                     # Dismiss general API issues
-                    await repairs.async_delete_auth_failure_issue(hass, entry_id)
-                    await repairs.async_delete_api_connection_failure_issue(hass, entry_id)
-                    await repairs.async_delete_invalid_response_issue(hass, entry_id)
+                    if not replay:
+                        with stage(profiler, "repairs"):
+                            await repairs.async_delete_auth_failure_issue(hass, entry_id)
+                            await repairs.async_delete_api_connection_failure_issue(hass, entry_id)
+                            await repairs.async_delete_invalid_response_issue(hass, entry_id)
                     
                     return mapping
 
-                # All stations failed
-                if has_errors:
-                    raise UpdateFailed("All station requests failed")
+                # All stations failed; keep the type of the first failure for backoff/metrics
+                if first_error is not None:
+                    error_cls = type(first_error) if isinstance(first_error, HolfuyError) else HolfuyError
+                    raise error_cls("All station requests failed") from first_error
 
                 return mapping
 
         except Exception as err:
             consecutive_errors += 1
-            
-            # Parse error type from message if present
-            error_str = str(err)
-            if "|||" in error_str:
-                error_msg, error_type = error_str.split("|||", 1)
-                last_error_type = error_type
-            else:
-                # Try to detect error type from message
-                if "auth" in error_str.lower() or "401" in error_str or "403" in error_str:
-                    last_error_type = "auth"
-                elif "timeout" in error_str.lower():
-                    last_error_type = "timeout"
-                elif "connection" in error_str.lower():
-                    last_error_type = "connection"
-                elif "invalid" in error_str.lower() and "json" in error_str.lower():
-                    last_error_type = "invalid_response"
-
-            # Implement exponential backoff
-            if consecutive_errors > 1:
+            last_error_type = err.error_type if isinstance(err, HolfuyError) else "unknown"
+
+            # Implement exponential backoff (not for replays, which must not throttle live polls)
+            if consecutive_errors > 1 and not replay:
                 new_interval = min(
                     DEFAULT_UPDATE_INTERVAL * (2 ** (consecutive_errors - 1)),
                     MAX_UPDATE_INTERVAL
@@ -290,18 +549,67 @@ def _make_update_method(api_key: str, stations: list[str], tu: str, su: str, coo
                     
                     # Create repair issue when reaching max throttle interval
                     if new_interval >= MAX_UPDATE_INTERVAL:
-                        await repairs.async_create_api_connection_failure_issue(hass, entry_id)
+                        with stage(profiler, "repairs"):
+                            await repairs.async_create_api_connection_failure_issue(hass, entry_id)
 
-            # Re-raise with clean error message
-            if "|||" in error_str:
-                error_msg, _ = error_str.split("|||", 1)
-                raise UpdateFailed(f"Error fetching Holfuy data: {error_msg}")
-            
-            raise UpdateFailed(f"Error fetching Holfuy data: {err}")
+            raise UpdateFailed(f"Error fetching Holfuy data: {err}") from err
 
     return async_update_data
 
 
+async def _async_create_virtual_station(hass: HomeAssistant, entry: ConfigEntry, stations: list[str]):
+    """Build the virtual station from member coordinates.
+
+    Coordinates are looked up in the station catalog once and stored in the entry,
+    so later setups do not depend on the catalog being reachable.
+    """
+    stored = entry.data.get(CONF_VIRTUAL_MEMBERS, {})
+    members = {str(s): tuple(stored[str(s)]) for s in stations if str(s) in stored}
+    missing = [str(s) for s in stations if str(s) not in members]
+    if missing:
+        index = await async_get_catalog(hass).async_get_index()
+        if index is None:
+            _LOGGER.warning("Station catalog unavailable, no location known for stations %s", ", ".join(missing))
+        else:
+            for station in missing:
+                info = index.get(station)
+                if info is None:
+                    _LOGGER.warning("No location known for station %s, leaving it out of the virtual station", station)
+                    continue
+                members[station] = (info["lat"], info["lon"])
+            if any(station not in stored for station in members):
+                hass.config_entries.async_update_entry(
+                    entry,
+                    data={**entry.data, CONF_VIRTUAL_MEMBERS: {k: list(v) for k, v in members.items()}},
+                )
+    if not members:
+        _LOGGER.warning("No member station locations known, virtual station disabled for now")
+        return None
+
+    return VirtualStation(
+        entry.entry_id,
+        entry.data.get(CONF_VIRTUAL_LATITUDE, hass.config.latitude),
+        entry.data.get(CONF_VIRTUAL_LONGITUDE, hass.config.longitude),
+        members,
+    )
+
+
+@callback
+def _async_track_virtual_retry(hass: HomeAssistant, entry: ConfigEntry, stations: list[str]) -> CALLBACK_TYPE:
+    """Retry building the virtual station (e.g. after starting offline) and reload once it works."""
+    done = False
+
+    async def _async_retry(_now) -> None:
+        nonlocal done
+        if done or await _async_create_virtual_station(hass, entry, stations) is None:
+            return
+        done = True
+        _LOGGER.info("Virtual station for Holfuy entry %s is available, reloading", entry.entry_id)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    return async_track_time_interval(hass, _async_retry, timedelta(seconds=RETRY_AFTER_FAILURE))
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     api_key = entry.data.get(CONF_API_KEY)
     stations = entry.data.get(CONF_STATION_IDS, [])
@@ -313,16 +621,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     su = entry.data.get(CONF_WIND_UNIT, DEFAULT_WIND_UNIT)
     tu = entry.data.get(CONF_TEMP_UNIT, DEFAULT_TEMP_UNIT)
 
-    coordinator = DataUpdateCoordinator(
+    # Metrics are opt-in; when disabled the fetch path skips all instrumentation
+    metrics = HolfuyMetrics() if entry.data.get(CONF_ENABLE_METRICS, False) else None
+
+    # Debug option: append raw API responses to a JSONL recording for later replay
+    recorder = None
+    if entry.data.get(CONF_RECORD_TRAFFIC, False):
+        recorder = TrafficRecorder(hass, hass.config.path(RECORDING_DIR, f"{entry.entry_id}.jsonl"))
+
+    virtual = None
+    if entry.data.get(CONF_VIRTUAL_STATION, False):
+        virtual = await _async_create_virtual_station(hass, entry, stations)
+        if virtual is None:
+            entry.async_on_unload(_async_track_virtual_retry(hass, entry, stations))
+
+    coordinator = TimestampDataUpdateCoordinator(
         hass,
         _LOGGER,
         name=f"Holfuy Weather ({entry.entry_id})",
         update_method=lambda: None,  # Placeholder, will be set below
         update_interval=DEFAULT_UPDATE_INTERVAL,
+        # Unchanged polls return the same data object, so listeners are not called
+        always_update=False,
     )
 
     # Set the actual update method with coordinator reference for throttling and repair issues
-    coordinator.update_method = _make_update_method(api_key, stations, tu, su, coordinator, hass, entry.entry_id)
+    coordinator.update_method = _make_update_method(
+        api_key, stations, tu, su, coordinator, hass, entry.entry_id, metrics, recorder, virtual
+    )
 
     try:
         await coordinator.async_config_entry_first_refresh()
@@ -330,12 +656,64 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         _LOGGER.error("Initial data fetch failed for Holfuy: %s", err)
         # allow setup to continue; coordinator will retry later
 
+    def _make_replay_update():
+        # Fresh state per replay, so recorded failures never leak into live polling
+        return _make_update_method(
+            api_key,
+            stations,
+            tu,
+            su,
+            coordinator,
+            hass,
+            entry.entry_id,
+            virtual=virtual.clone() if virtual is not None else None,
+            replay=True,
+        )
+
+    # In-memory history for the holfuy/history websocket command, seeded with the first refresh
+    history = HistoryStore(coordinator)
+    history.async_handle_update()
+    entry.async_on_unload(coordinator.async_add_listener(history.async_handle_update))
+
+    # Optional wind-rose accumulators, one per station and window
+    wind_rose = None
+    try:
+        wind_rose_windows = parse_windows(entry.data.get(CONF_WIND_ROSE_WINDOWS, DEFAULT_WIND_ROSE_WINDOWS))
+    except ValueError:
+        _LOGGER.warning("Ignoring invalid wind rose windows for Holfuy entry %s", entry.entry_id)
+        wind_rose_windows = []
+    if wind_rose_windows:
+        wind_rose = WindRoseStore(coordinator, wind_rose_windows, su)
+        wind_rose.async_handle_update()
+        entry.async_on_unload(coordinator.async_add_listener(wind_rose.async_handle_update))
+
+    # Optional file export; rows are batched and written in the executor
+    exporter = None
+    export_format = entry.data.get(CONF_EXPORT_FORMAT, DEFAULT_EXPORT_FORMAT)
+    if export_format != EXPORT_NONE:
+        exporter = ReadingExporter(hass, coordinator, entry.entry_id, export_format)
+        exporter.async_handle_update()
+        entry.async_on_unload(exporter.async_start())
+
     # store coordinator and station list under entry
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
         "stations": [str(s) for s in stations],
+        "metrics": metrics,
+        "profiler": None,
+        "virtual": virtual.station_id if virtual is not None else None,
+        "replay": _make_replay_update,
+        "history": history,
+        "exporter": exporter,
+        "wind_rose": wind_rose,
+        "refresh": RefreshGate(
+            hass, coordinator, timedelta(seconds=entry.data.get(CONF_REFRESH_TTL, DEFAULT_REFRESH_TTL))
+        ),
     }
 
+    await async_setup_services(hass)
+    async_setup_websocket(hass)
+
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
 
     return True
@@ -346,8 +724,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-        # Clean up all repair issues for this entry
+        # Clean up all repair issues for this entry (needs the station list still in hass.data)
         await repairs.async_delete_all_issues(hass, entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        if entry_data.get("profiler") is not None:
+            entry_data["profiler"].detach()
+        if entry_data.get("exporter") is not None:
+            await entry_data["exporter"].async_close()
+        await async_unload_services(hass)
 
     return unload_ok
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""Cached, spatially indexed catalog of public Holfuy stations."""
+import asyncio
+import logging
+import math
+import time
+from array import array
+
+import aiohttp
+import async_timeout
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STATIONS_URL
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CATALOG = f"{DOMAIN}_catalog"
+
+STORAGE_KEY = f"{DOMAIN}.station_catalog"
+STORAGE_VERSION = 1
+
+# Revalidate the cached list (conditional request) once it is older than this
+CATALOG_TTL = 7 * 24 * 3600
+# After a failed download, wait this long before trying again
+RETRY_AFTER_FAILURE = 15 * 60
+
+# Grid cell size in degrees for the spatial index
+CELL_DEG = 1.0
+KM_PER_DEG = 111.195
+EARTH_RADIUS_KM = 6371.0
+_LON_CELLS = int(360 / CELL_DEG)
+_LAT_CELLS = int(180 / CELL_DEG)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in km."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _parse_stations(response) -> list[dict]:
+    """Normalise the station list into [{"id", "name", "lat", "lon"}].
+
+    Accepts a bare list or a dict wrapping the list under any key, with coordinates
+    either nested in a "location" object or at the top level of each item.
+    """
+    items = response
+    if isinstance(response, dict):
+        items = next((v for v in response.values() if isinstance(v, list)), [])
+    if not isinstance(items, list):
+        return []
+
+    stations = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        station_id = next((item[k] for k in ("id", "stationId", "station", "s") if k in item), None)
+        loc = item.get("location") if isinstance(item.get("location"), dict) else item
+        lat = next((loc[k] for k in ("latitude", "lat") if k in loc), None)
+        lon = next((loc[k] for k in ("longitude", "lon", "lng") if k in loc), None)
+        try:
+            lat = float(lat)
+            lon = float(lon)
+        except (TypeError, ValueError):
+            continue
+        if station_id is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            continue
+        stations.append(
+            {
+                "id": str(station_id),
+                "name": item.get("name") or item.get("stationName") or f"Station {station_id}",
+                "lat": lat,
+                "lon": lon,
+            }
+        )
+    return stations
+
+
+def _cell(lat: float, lon: float) -> tuple[int, int]:
+    row = min(int((lat + 90) // CELL_DEG), _LAT_CELLS - 1)
+    col = int((lon + 180) // CELL_DEG) % _LON_CELLS
+    return row, col
+
+
+class StationIndex:
+    """Uniform lat/lon grid over the station list for nearest-N lookups."""
+
+    def __init__(self, stations: list[dict]):
+        self.stations = stations
+        self._lat = array("d", (s["lat"] for s in stations))
+        self._lon = array("d", (s["lon"] for s in stations))
+        self._by_id = {s["id"]: i for i, s in enumerate(stations)}
+        self._grid: dict[tuple[int, int], list[int]] = {}
+        for i, station in enumerate(stations):
+            self._grid.setdefault(_cell(station["lat"], station["lon"]), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def get(self, station_id: str) -> dict | None:
+        """Return a station by id."""
+        index = self._by_id.get(str(station_id))
+        return self.stations[index] if index is not None else None
+
+    def _ring(self, row: int, col: int, radius: int):
+        """Yield station indexes in the square ring of cells at the given radius."""
+        for dr in range(-radius, radius + 1):
+            r = row + dr
+            if r < 0 or r >= _LAT_CELLS:
+                continue
+            if abs(dr) == radius:
+                cols = {(col + dc) % _LON_CELLS for dc in range(-radius, radius + 1)}
+            else:
+                cols = {(col - radius) % _LON_CELLS, (col + radius) % _LON_CELLS}
+            for c in cols:
+                yield from self._grid.get((r, c), ())
+
+    def nearest(self, lat: float, lon: float, count: int) -> list[tuple[dict, float]]:
+        """Return up to count (station, distance_km) pairs, closest first.
+
+        Scans rings of grid cells outwards and stops once no unscanned cell can
+        hold a station closer than the current count-th best.
+        """
+        if not self.stations or count <= 0:
+            return []
+        row, col = _cell(lat, lon)
+        found: list[tuple[float, int]] = []
+        max_radius = max(_LAT_CELLS, _LON_CELLS // 2)
+        for radius in range(max_radius + 1):
+            for i in self._ring(row, col, radius):
+                found.append((haversine_km(lat, lon, self._lat[i], self._lon[i]), i))
+            if len(found) >= count:
+                found.sort()
+                # Any unscanned station is at least `radius` whole cells away in lat or lon
+                max_lat = min(90.0, abs(lat) + (radius + 1) * CELL_DEG)
+                span = math.radians(radius * CELL_DEG)
+                lon_bound = 2 * EARTH_RADIUS_KM * math.asin(
+                    min(1.0, math.cos(math.radians(max_lat)) * math.sin(min(span, math.pi) / 2))
+                )
+                bound = min(radius * CELL_DEG * KM_PER_DEG, lon_bound)
+                if found[count - 1][0] <= bound:
+                    break
+        found.sort()
+        return [(self.stations[i], dist) for dist, i in found[:count]]
+
+
+class StationCatalog:
+    """Holfuy station list persisted in HA storage and revalidated with ETag/TTL.
+
+    A failed download is not retried for RETRY_AFTER_FAILURE, so callers such as the
+    config flow do not wait on the request timeout every time they ask for the index.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._lock = asyncio.Lock()
+        self._cache: dict | None = None
+        self._retry_at = 0.0
+        self.index: StationIndex | None = None
+
+    async def async_get_index(self) -> StationIndex | None:
+        """Return the spatial index, loading or revalidating the list when needed."""
+        async with self._lock:
+            if self._cache is None:
+                try:
+                    self._cache = await self._store.async_load()
+                except HomeAssistantError as err:
+                    _LOGGER.warning("Discarding unreadable Holfuy station catalog: %s", err)
+                    self._cache = {}
+                if self._cache:
+                    self.index = StationIndex(self._cache.get("stations", []))
+            fetched_at = (self._cache or {}).get("fetched_at", 0)
+            expired = self.index is None or time.time() - fetched_at > CATALOG_TTL
+            if expired and time.monotonic() >= self._retry_at and not await self._async_refresh():
+                self._retry_at = time.monotonic() + RETRY_AFTER_FAILURE
+            return self.index
+
+    async def _async_refresh(self) -> bool:
+        """Download the station list, using a conditional request when cached.
+
+        Returns False when the list could not be refreshed.
+        """
+        headers = {}
+        if self._cache:
+            if self._cache.get("etag"):
+                headers["If-None-Match"] = self._cache["etag"]
+            if self._cache.get("last_modified"):
+                headers["If-Modified-Since"] = self._cache["last_modified"]
+        try:
+            async with (
+                aiohttp.ClientSession() as session,
+                async_timeout.timeout(20),
+                session.get(STATIONS_URL, headers=headers) as resp,
+            ):
+                if resp.status == 304 and self._cache:
+                    self._cache["fetched_at"] = time.time()
+                    await self._store.async_save(self._cache)
+                    return True
+                resp.raise_for_status()
+                response = await resp.json(content_type=None)
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+        except (aiohttp.ClientError, TimeoutError, ValueError) as err:
+            # Keep serving a stale list rather than nothing
+            _LOGGER.warning("Could not refresh Holfuy station catalog: %s", err)
+            return False
+
+        stations = _parse_stations(response)
+        if not stations:
+            _LOGGER.warning("Holfuy station catalog response contained no usable stations")
+            return False
+        self._cache = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "stations": stations,
+        }
+        self.index = StationIndex(stations)
+        await self._store.async_save(self._cache)
+        _LOGGER.debug("Loaded %d Holfuy stations into the catalog", len(stations))
+        return True
+
+
+def async_get_catalog(hass: HomeAssistant) -> StationCatalog:
+    """Return the shared station catalog."""
+    if DATA_CATALOG not in hass.data:
+        hass.data[DATA_CATALOG] = StationCatalog(hass)
+    return hass.data[DATA_CATALOG]
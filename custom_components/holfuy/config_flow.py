@@ -4,6 +4,7 @@ import logging
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_API_KEY
+import homeassistant.helpers.config_validation as cv
 import aiohttp
 import async_timeout
 from .const import (
@@ -14,8 +15,28 @@ from .const import (
     DEFAULT_WIND_UNIT,
     DEFAULT_TEMP_UNIT,
     API_URL,
+    CONF_ENABLE_METRICS,
+    CONF_RECORD_TRAFFIC,
+    CONF_DEADBAND_WIND,
+    CONF_DEADBAND_DIRECTION,
+    CONF_DEADBAND_TEMP,
+    CONF_MAX_SILENCE,
+    DEFAULT_DEADBAND,
+    DEFAULT_MAX_SILENCE,
+    CONF_VIRTUAL_STATION,
+    CONF_VIRTUAL_LATITUDE,
+    CONF_VIRTUAL_LONGITUDE,
+    CONF_REFRESH_TTL,
+    DEFAULT_REFRESH_TTL,
+    CONF_EXPORT_FORMAT,
+    DEFAULT_EXPORT_FORMAT,
+    CONF_WIND_ROSE_WINDOWS,
+    DEFAULT_WIND_ROSE_WINDOWS,
 )
 from . import repairs
+from .catalog import async_get_catalog
+from .export import EXPORT_FORMATS, EXPORT_PARQUET, parquet_available
+from .windrose import parse_windows
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +45,10 @@ TEMP_UNIT_OPTIONS = ["C", "F"]
 MAX_STATIONS = 3
 MAX_STATION_ID = 65000
 
+# Nearby-station discovery in the user step
+CONF_NEARBY_STATIONS = "nearby_stations"
+NEARBY_STATION_COUNT = 10
+
 
 async def _validate_api_key_and_stations(api_key: str, stations: list[str], tu: str, su: str):
     """Validate API key and stations by making test API calls.
@@ -78,6 +103,20 @@ async def _validate_api_key_and_stations(api_key: str, stations: list[str], tu:
     return {"valid": True}
 
 
+async def _async_nearby_station_options(hass) -> dict[str, str]:
+    """Return the stations closest to the HA home location as multi-select options.
+
+    Uses the cached station catalog; returns an empty dict when it is unavailable so
+    the form falls back to manual entry only.
+    """
+    index = await async_get_catalog(hass).async_get_index()
+    if index is None:
+        return {}
+
+    nearest = index.nearest(hass.config.latitude, hass.config.longitude, NEARBY_STATION_COUNT)
+    return {station["id"]: f"{station['name']} ({station['id']}, {dist:.0f} km)" for station, dist in nearest}
+
+
 def _normalize_station_input(value: str):
     """Extract integers from the provided string, trim duplicates and validate.
 
@@ -122,19 +161,32 @@ def _normalize_station_input(value: str):
 
 
 class HolfuyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    def __init__(self):
+        """Initialize the flow."""
+        # Looked up once per flow, not again on every submit
+        self._nearby: dict[str, str] | None = None
+
     async def async_step_user(self, user_input=None):
         """Handle the initial config flow."""
-        schema = vol.Schema(
+        if self._nearby is None:
+            self._nearby = await _async_nearby_station_options(self.hass)
+        nearby = self._nearby
+        fields = {vol.Required(CONF_API_KEY): str}
+        if nearby:
+            fields[vol.Optional(CONF_NEARBY_STATIONS, default=[])] = cv.multi_select(nearby)
+        fields.update(
             {
-                vol.Required(CONF_API_KEY): str,
-                vol.Required(CONF_STATION_IDS, default=""): str,
+                vol.Optional(CONF_STATION_IDS, default=""): str,
                 vol.Required(CONF_WIND_UNIT, default=DEFAULT_WIND_UNIT): vol.In(WIND_UNIT_OPTIONS),
                 vol.Required(CONF_TEMP_UNIT, default=DEFAULT_TEMP_UNIT): vol.In(TEMP_UNIT_OPTIONS),
             }
         )
+        schema = vol.Schema(fields)
 
         if user_input is not None:
-            station_input = user_input.pop(CONF_STATION_IDS)
+            # Picked nearby stations are merged with any typed IDs and validated together
+            selected = user_input.pop(CONF_NEARBY_STATIONS, [])
+            station_input = " ".join([user_input.pop(CONF_STATION_IDS, ""), *selected])
             try:
                 stations = _normalize_station_input(station_input)
             except vol.Invalid:
@@ -191,6 +243,54 @@ class HolfuyOptionsFlow(config_entries.OptionsFlow):
                     CONF_TEMP_UNIT,
                     default=existing.get(CONF_TEMP_UNIT, DEFAULT_TEMP_UNIT),
                 ): vol.In(TEMP_UNIT_OPTIONS),
+                vol.Optional(
+                    CONF_ENABLE_METRICS,
+                    default=existing.get(CONF_ENABLE_METRICS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_RECORD_TRAFFIC,
+                    default=existing.get(CONF_RECORD_TRAFFIC, False),
+                ): bool,
+                vol.Optional(
+                    CONF_DEADBAND_WIND,
+                    default=existing.get(CONF_DEADBAND_WIND, DEFAULT_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_DEADBAND_DIRECTION,
+                    default=existing.get(CONF_DEADBAND_DIRECTION, DEFAULT_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=180)),
+                vol.Optional(
+                    CONF_DEADBAND_TEMP,
+                    default=existing.get(CONF_DEADBAND_TEMP, DEFAULT_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_MAX_SILENCE,
+                    default=existing.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_VIRTUAL_STATION,
+                    default=existing.get(CONF_VIRTUAL_STATION, False),
+                ): bool,
+                vol.Optional(
+                    CONF_VIRTUAL_LATITUDE,
+                    default=existing.get(CONF_VIRTUAL_LATITUDE, self.hass.config.latitude),
+                ): cv.latitude,
+                vol.Optional(
+                    CONF_VIRTUAL_LONGITUDE,
+                    default=existing.get(CONF_VIRTUAL_LONGITUDE, self.hass.config.longitude),
+                ): cv.longitude,
+                vol.Optional(
+                    CONF_REFRESH_TTL,
+                    default=existing.get(CONF_REFRESH_TTL, DEFAULT_REFRESH_TTL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Optional(
+                    CONF_EXPORT_FORMAT,
+                    default=existing.get(CONF_EXPORT_FORMAT, DEFAULT_EXPORT_FORMAT),
+                ): vol.In(EXPORT_FORMATS),
+                vol.Optional(
+                    CONF_WIND_ROSE_WINDOWS,
+                    default=existing.get(CONF_WIND_ROSE_WINDOWS, DEFAULT_WIND_ROSE_WINDOWS),
+                ): str,
             }
         )
 
@@ -201,6 +301,20 @@ class HolfuyOptionsFlow(config_entries.OptionsFlow):
             except vol.Invalid:
                 return self.async_show_form(step_id="init", data_schema=schema, errors={"base": "invalid_station_ids"})
 
+            try:
+                windows = parse_windows(user_input.get(CONF_WIND_ROSE_WINDOWS, DEFAULT_WIND_ROSE_WINDOWS))
+            except ValueError:
+                return self.async_show_form(
+                    step_id="init", data_schema=schema, errors={"base": "invalid_wind_rose_windows"}
+                )
+            user_input[CONF_WIND_ROSE_WINDOWS] = ",".join(str(hours) for hours in windows)
+
+            # pyarrow is optional and not in the manifest requirements
+            if user_input.get(CONF_EXPORT_FORMAT) == EXPORT_PARQUET and not await self.hass.async_add_executor_job(
+                parquet_available
+            ):
+                return self.async_show_form(step_id="init", data_schema=schema, errors={"base": "parquet_unavailable"})
+
             # Validate API key and stations by making test API calls
             api_key = user_input[CONF_API_KEY]
             tu = user_input.get(CONF_TEMP_UNIT, DEFAULT_TEMP_UNIT)
@@ -6,9 +6,47 @@ CONF_API_KEY = "api_key"
 CONF_WIND_UNIT = "wind_unit"
 CONF_TEMP_UNIT = "temp_unit"
 
+# Config key for request/cycle metrics (diagnostics download and diagnostic sensors)
+CONF_ENABLE_METRICS = "enable_metrics"
+
+# Debug option: record raw API traffic to a JSONL file for replay
+CONF_RECORD_TRAFFIC = "record_traffic"
+
+# Recorder footprint: minimum change before a new state is written, per sensor type.
+# Wind deadband is in the configured wind unit, direction in degrees, temperature in the configured unit.
+CONF_DEADBAND_WIND = "deadband_wind"
+CONF_DEADBAND_DIRECTION = "deadband_direction"
+CONF_DEADBAND_TEMP = "deadband_temp"
+CONF_MAX_SILENCE = "max_silence"  # minutes; a state is always written after this long
+
+DEFAULT_DEADBAND = 0.0      # 0 disables filtering (every change is written)
+DEFAULT_MAX_SILENCE = 15
+
 # Defaults
 DEFAULT_WIND_UNIT = "m/s"   # options: "knots", "km/h", "m/s", "mph"
 DEFAULT_TEMP_UNIT = "C"     # options: "C", "F"
 
+# Virtual station interpolated from the entry's stations (location defaults to HA home)
+CONF_VIRTUAL_STATION = "virtual_station"
+CONF_VIRTUAL_LATITUDE = "virtual_latitude"
+CONF_VIRTUAL_LONGITUDE = "virtual_longitude"
+# Member station coordinates, stored once looked up so setup works without the catalog
+CONF_VIRTUAL_MEMBERS = "virtual_members"
+
+# Manual refreshes (holfuy.refresh, update_entity) reuse data younger than this many seconds
+CONF_REFRESH_TTL = "refresh_ttl"
+DEFAULT_REFRESH_TTL = 60
+
+# Optional export of readings to local files: "none", "csv", "line_protocol" or "parquet"
+CONF_EXPORT_FORMAT = "export_format"
+DEFAULT_EXPORT_FORMAT = "none"
+
+# Wind-rose sensors: comma-separated window lengths in hours, e.g. "1,24,168" (empty = off)
+CONF_WIND_ROSE_WINDOWS = "wind_rose_windows"
+DEFAULT_WIND_ROSE_WINDOWS = ""
+
 # API URL accepts placeholders for tu and su
 API_URL = "http://api.holfuy.com/live/?s={station}&pw={api_key}&m=JSON&tu={tu}&su={su}"
+
+# Public list of all Holfuy stations (id, name, location), used for nearby-station discovery
+STATIONS_URL = "https://api.holfuy.com/stations/stations.json"
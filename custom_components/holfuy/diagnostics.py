@@ -0,0 +1,30 @@
+"""Diagnostics support for Holfuy integration."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, DOMAIN
+
+TO_REDACT = {CONF_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    coordinator = entry_data.get("coordinator")
+    metrics = entry_data.get("metrics")
+
+    coordinator_info = None
+    if coordinator is not None:
+        coordinator_info = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "stations_with_data": sorted((coordinator.data or {}).keys()),
+        }
+
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "stations": entry_data.get("stations", []),
+        "coordinator": coordinator_info,
+        "metrics": metrics.as_dict() if metrics is not None else None,
+    }
@@ -0,0 +1,55 @@
+"""Exceptions raised by the Holfuy fetch layer."""
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+
+class HolfuyError(UpdateFailed):
+    """Base class for Holfuy API request failures.
+
+    Subclasses UpdateFailed so the coordinator treats any of them as a failed update.
+    The error_type class attribute is the stable key used for backoff, repair issues and metrics.
+    """
+
+    error_type = "unknown"
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status: int | None = None,
+        station: str | None = None,
+        latency: float | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.station = station
+        self.latency = latency
+
+
+class HolfuyAuthError(HolfuyError):
+    """API key rejected (401/403)."""
+
+    error_type = "auth"
+
+
+class HolfuyInvalidResponseError(HolfuyError):
+    """Response body was not valid JSON."""
+
+    error_type = "invalid_response"
+
+
+class HolfuyHttpError(HolfuyError):
+    """Non-auth HTTP error status."""
+
+    error_type = "http_error"
+
+
+class HolfuyConnectionError(HolfuyError):
+    """Network level failure (DNS, connect, reset)."""
+
+    error_type = "connection"
+
+
+class HolfuyTimeoutError(HolfuyError):
+    """Request did not complete within the timeout."""
+
+    error_type = "timeout"
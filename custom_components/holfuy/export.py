@@ -0,0 +1,277 @@
+"""Batched, off-loop export of readings to local time-series files."""
+import asyncio
+import csv
+import importlib.util
+import logging
+import os
+from collections import deque
+from datetime import UTC, datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .traffic import ReplayedData
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_DIR = "holfuy_export"
+
+EXPORT_NONE = "none"
+EXPORT_CSV = "csv"
+EXPORT_LINE_PROTOCOL = "line_protocol"
+EXPORT_PARQUET = "parquet"
+EXPORT_FORMATS = [EXPORT_NONE, EXPORT_CSV, EXPORT_LINE_PROTOCOL, EXPORT_PARQUET]
+
+# Flush when this many rows are buffered, or every FLUSH_INTERVAL, whichever comes first
+FLUSH_ROWS = 500
+FLUSH_INTERVAL = timedelta(minutes=1)
+# Upper bound on buffered rows; when the disk falls behind the oldest rows are dropped
+MAX_BUFFER_ROWS = 20000
+
+FIELDS = ("speed", "gust", "min", "direction", "temperature")
+CSV_HEADER = ("timestamp", "station_id", "station_name", "station_time", *FIELDS)
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _row(ts: float, station_id: str, station_data: dict) -> tuple:
+    wind = station_data.get("wind") if isinstance(station_data.get("wind"), dict) else {}
+    return (
+        ts,
+        station_id,
+        station_data.get("stationName"),
+        station_data.get("dateTime"),
+        _number(wind.get("speed")),
+        _number(wind.get("gust")),
+        _number(wind.get("min")),
+        _number(wind.get("direction")),
+        _number(station_data.get("temperature")),
+    )
+
+
+def parquet_available() -> bool:
+    """Return True when pyarrow can be imported (does file system I/O)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _escape_tag(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _write_csv(path: str, rows: list[tuple]) -> None:
+    new_file = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        if new_file:
+            writer.writerow(CSV_HEADER)
+        for ts, *rest in rows:
+            writer.writerow((datetime.fromtimestamp(ts, UTC).isoformat(), *rest))
+
+
+def _write_line_protocol(path: str, rows: list[tuple]) -> None:
+    lines = []
+    for ts, station_id, _name, _station_time, *values in rows:
+        fields = ",".join(f"{name}={float(value)}" for name, value in zip(FIELDS, values) if value is not None)
+        if fields:
+            lines.append(f"holfuy,station={_escape_tag(station_id)} {fields} {int(ts * 1e9)}")
+    if lines:
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+
+
+def _parquet_schema():
+    # Optional dependency, only needed when Parquet export is selected
+    import pyarrow as pa
+
+    # Explicit types, so all-None columns do not come out as null and every file matches
+    return pa.schema(
+        [
+            ("timestamp", pa.timestamp("s", "UTC")),
+            ("station_id", pa.string()),
+            ("station_name", pa.string()),
+            ("station_time", pa.string()),
+            *[(name, pa.float64()) for name in FIELDS],
+        ]
+    )
+
+
+def _parquet_table(schema, rows: list[tuple]):
+    import pyarrow as pa
+
+    columns = list(zip(*rows))
+    ts, station_id, station_name, station_time, *values = columns
+    arrays = [
+        [datetime.fromtimestamp(value, UTC) for value in ts],
+        [str(value) for value in station_id],
+        [None if value is None else str(value) for value in station_name],
+        [None if value is None else str(value) for value in station_time],
+        *values,
+    ]
+    return pa.Table.from_arrays(
+        [pa.array(column, field.type) for column, field in zip(arrays, schema)], schema=schema
+    )
+
+
+def _unused_path(directory: str, day: str, extension: str) -> str:
+    """Return the day's file, or a numbered part when it already exists (e.g. after a restart)."""
+    path = os.path.join(directory, f"{day}.{extension}")
+    part = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{day}_{part}.{extension}")
+        part += 1
+    return path
+
+
+class ReadingExporter:
+    """Buffer parsed readings on the event loop and write them in batches in the executor.
+
+    Files rotate daily per entry. Only one write runs at a time; while the disk is
+    slow or a write fails, rows keep buffering (failed batches are put back) up to
+    MAX_BUFFER_ROWS and then the oldest are dropped.
+
+    Parquet files cannot be appended to, so one ParquetWriter stays open per day and
+    each flush adds a row group; the file is finalised on rotation or when closing.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator, entry_id: str, fmt: str):
+        self._hass = hass
+        self._coordinator = coordinator
+        self._fmt = fmt
+        self._directory = hass.config.path(EXPORT_DIR, entry_id)
+        self._buffer: deque[tuple] = deque(maxlen=MAX_BUFFER_ROWS)
+        self._last_stamp: dict[str, object] = {}
+        self._lock = asyncio.Lock()
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._failing = False
+        # (day, pyarrow.parquet.ParquetWriter), only touched from the executor
+        self._parquet = None
+        self.dropped = 0
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start listening for updates and the periodic flush; returns a stop callback."""
+        self._unsubs = [
+            self._coordinator.async_add_listener(self.async_handle_update),
+            async_track_time_interval(self._hass, self._async_flush_interval, FLUSH_INTERVAL),
+        ]
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening for updates and the periodic flush."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    async def async_close(self) -> None:
+        """Stop, then write everything still buffered, waiting for a running write first."""
+        self.async_stop()
+        await self.async_flush(wait=True)
+        if self._parquet is not None:
+            async with self._lock:
+                try:
+                    await self._hass.async_add_executor_job(self._close_parquet)
+                except OSError as err:
+                    _LOGGER.error("Failed to finalise Holfuy Parquet export: %s", err)
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Queue one row per station whose dateTime advanced."""
+        data = self._coordinator.data
+        # Replayed recordings are old readings and do not belong in the archive
+        if not isinstance(data, dict) or isinstance(data, ReplayedData):
+            return
+        now = dt_util.utcnow().timestamp()
+        for station_id, station_data in data.items():
+            if not isinstance(station_data, dict):
+                continue
+            stamp = station_data.get("dateTime")
+            if stamp is not None and self._last_stamp.get(station_id) == stamp:
+                continue
+            self._last_stamp[station_id] = stamp
+            if len(self._buffer) == self._buffer.maxlen:
+                self._count_dropped(1)
+            self._buffer.append(_row(now, station_id, station_data))
+        if len(self._buffer) >= FLUSH_ROWS:
+            self._hass.async_create_task(self.async_flush())
+
+    async def _async_flush_interval(self, _now) -> None:
+        await self.async_flush()
+
+    def _count_dropped(self, count: int) -> None:
+        if not self.dropped:
+            _LOGGER.warning("Holfuy export is falling behind, dropping oldest buffered rows")
+        self.dropped += count
+
+    async def async_flush(self, wait: bool = False) -> None:
+        """Write buffered rows in the executor.
+
+        Returns at once while another write is running, unless wait is set.
+        """
+        if self._lock.locked() and not wait:
+            return
+        async with self._lock:
+            if not self._buffer:
+                return
+            rows = list(self._buffer)
+            self._buffer.clear()
+            try:
+                await self._hass.async_add_executor_job(self._write, rows)
+            except (OSError, ImportError) as err:
+                if not self._failing:
+                    _LOGGER.error("Failed to export Holfuy readings, keeping them buffered: %s", err)
+                    self._failing = True
+                # Put the batch back ahead of rows that arrived meanwhile, within the buffer bound
+                overflow = len(rows) + len(self._buffer) - MAX_BUFFER_ROWS
+                if overflow > 0:
+                    self._count_dropped(overflow)
+                self._buffer.extendleft(reversed(rows[max(overflow, 0):]))
+                return
+            if self._failing:
+                _LOGGER.info("Holfuy export is writing again")
+                self._failing = False
+            if self.dropped:
+                _LOGGER.warning("Holfuy export caught up; %d rows were dropped", self.dropped)
+                self.dropped = 0
+
+    def _write(self, rows: list[tuple]) -> None:
+        """Append rows to the current file (runs in the executor)."""
+        os.makedirs(self._directory, exist_ok=True)
+        now = datetime.now(UTC)
+        day = now.strftime("%Y-%m-%d")
+        if self._fmt == EXPORT_CSV:
+            _write_csv(os.path.join(self._directory, f"{day}.csv"), rows)
+        elif self._fmt == EXPORT_LINE_PROTOCOL:
+            _write_line_protocol(os.path.join(self._directory, f"{day}.lp"), rows)
+        elif self._fmt == EXPORT_PARQUET:
+            self._write_parquet(day, rows)
+
+    def _write_parquet(self, day: str, rows: list[tuple]) -> None:
+        """Add rows as a row group to the day's Parquet file (runs in the executor)."""
+        import pyarrow.parquet as pq
+
+        if self._parquet is not None and self._parquet[0] != day:
+            self._close_parquet()
+        if self._parquet is None:
+            schema = _parquet_schema()
+            self._parquet = (day, pq.ParquetWriter(_unused_path(self._directory, day, "parquet"), schema))
+        writer = self._parquet[1]
+        try:
+            writer.write_table(_parquet_table(writer.schema, rows))
+        except OSError:
+            # The writer may be unusable now; the requeued rows go to a new part
+            self._parquet = None
+            try:
+                writer.close()
+            except OSError:
+                pass
+            raise
+
+    def _close_parquet(self) -> None:
+        """Write the Parquet footer of the current file (runs in the executor)."""
+        if self._parquet is not None:
+            _, writer = self._parquet
+            self._parquet = None
+            writer.close()
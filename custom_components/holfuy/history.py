@@ -0,0 +1,134 @@
+"""Bounded in-memory reading history per station, stored in array-backed columns."""
+import math
+from array import array
+from collections.abc import Callable
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util import dt as dt_util
+
+from .traffic import ReplayedData
+
+# Keep this much history per station
+HISTORY_RETENTION = 24 * 3600
+# One sample per poll; polls are at most once a minute
+HISTORY_CAPACITY = 1440
+
+# Column name -> (array typecode, getter on the station data)
+COLUMNS = {
+    "speed": ("f", lambda d: (d.get("wind") or {}).get("speed")),
+    "gust": ("f", lambda d: (d.get("wind") or {}).get("gust")),
+    "min": ("f", lambda d: (d.get("wind") or {}).get("min")),
+    "direction": ("f", lambda d: (d.get("wind") or {}).get("direction")),
+    "temperature": ("f", lambda d: d.get("temperature")),
+}
+
+
+def _to_float(value) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+def _to_json(value: float):
+    # NaN marks a missing reading and is not valid JSON
+    return None if math.isnan(value) else round(value, 2)
+
+
+class StationHistory:
+    """Fixed-capacity ring buffer of samples with one array per column."""
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY):
+        self._capacity = capacity
+        self._ts = array("d", bytes(8 * capacity))
+        self._columns = {name: array(code, bytes(array(code).itemsize * capacity)) for name, (code, _) in COLUMNS.items()}
+        self._start = 0
+        self._count = 0
+        self.last_stamp = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, ts: float, station_data: dict) -> dict:
+        """Add a sample and return it as a one-row columnar delta."""
+        if self._count == self._capacity:
+            index = self._start
+            self._start = (self._start + 1) % self._capacity
+        else:
+            index = (self._start + self._count) % self._capacity
+            self._count += 1
+        self._ts[index] = ts
+        for name, (_, getter) in COLUMNS.items():
+            self._columns[name][index] = _to_float(getter(station_data))
+        return self._rows(index, 1)
+
+    def expire(self, before: float) -> None:
+        """Drop samples older than the given timestamp."""
+        while self._count and self._ts[self._start] < before:
+            self._start = (self._start + 1) % self._capacity
+            self._count -= 1
+
+    def _rows(self, first: int, count: int) -> dict:
+        indexes = [(first + i) % self._capacity for i in range(count)]
+        result = {"ts": [self._ts[i] for i in indexes]}
+        for name, column in self._columns.items():
+            result[name] = [_to_json(column[i]) for i in indexes]
+        return result
+
+    def since(self, since: float | None = None) -> dict:
+        """Return samples newer than since (all when None) as columnar lists."""
+        skip = 0
+        if since is not None:
+            # Timestamps are appended in order, so the first newer sample bounds the slice
+            while skip < self._count and self._ts[(self._start + skip) % self._capacity] <= since:
+                skip += 1
+        return self._rows((self._start + skip) % self._capacity, self._count - skip)
+
+
+class HistoryStore:
+    """Per-entry history for all stations, fed from coordinator updates."""
+
+    def __init__(self, coordinator):
+        self._coordinator = coordinator
+        self.stations: dict[str, StationHistory] = {}
+        self._subscribers: dict[str, list[Callable[[str, dict], None]]] = {}
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Record one sample per station whose dateTime advanced."""
+        data = self._coordinator.data
+        # Replayed readings are old and would land in the history stamped as current
+        if not isinstance(data, dict) or isinstance(data, ReplayedData):
+            return
+        now = dt_util.utcnow().timestamp()
+        for station_id, station_data in data.items():
+            if not isinstance(station_data, dict):
+                continue
+            history = self.stations.setdefault(station_id, StationHistory())
+            history.expire(now - HISTORY_RETENTION)
+            stamp = station_data.get("dateTime")
+            if stamp is not None and stamp == history.last_stamp:
+                continue
+            history.last_stamp = stamp
+            delta = history.append(now, station_data)
+            for subscriber in self._subscribers.get(station_id, ()):
+                subscriber(station_id, delta)
+
+    def get(self, station_id: str, since: float | None = None) -> dict | None:
+        """Return columnar history for a station, or None when unknown."""
+        history = self.stations.get(station_id)
+        if history is None:
+            return None
+        history.expire(dt_util.utcnow().timestamp() - HISTORY_RETENTION)
+        return history.since(since)
+
+    @callback
+    def async_subscribe(self, station_id: str, subscriber: Callable[[str, dict], None]) -> CALLBACK_TYPE:
+        """Call subscriber with each new sample for the station; returns an unsubscribe callback."""
+        subscribers = self._subscribers.setdefault(station_id, [])
+        subscribers.append(subscriber)
+
+        @callback
+        def unsubscribe() -> None:
+            subscribers.remove(subscriber)
+
+        return unsubscribe
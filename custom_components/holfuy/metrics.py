@@ -0,0 +1,182 @@
+"""Request and update-cycle metrics for the Holfuy integration."""
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import aiohttp
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open ended
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Fetch paths taken by an update cycle
+PATH_COMBINED = "combined"
+PATH_FALLBACK = "fallback"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("count", "counts", "last_ms", "max_ms", "total_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = None
+
+    def observe(self, ms: float) -> None:
+        """Record one sample in milliseconds."""
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.last_ms = ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self) -> dict:
+        """Return a JSON serialisable snapshot."""
+        labels = [f"<={b}" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "max_ms": round(self.max_ms, 1),
+            "last_ms": round(self.last_ms, 1) if self.last_ms is not None else None,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class HolfuyMetrics:
+    """Collect timing, transfer and error statistics for one config entry.
+
+    Only created when metrics are enabled for the entry, so the fetch path
+    does nothing beyond a None check when they are disabled.
+    """
+
+    def __init__(self):
+        self.latency = {
+            "dns": LatencyHistogram(),
+            "connect": LatencyHistogram(),
+            "request": LatencyHistogram(),
+            "cycle": LatencyHistogram(),
+        }
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.requests_total = 0
+        self.not_modified = 0
+        self.cycles = 0
+        self.paths = Counter()
+        self.errors = Counter()
+        self.last_cycle = None
+        self._cycle = None
+        self._cycle_start = None
+        self._listeners: list[Callable[[], None]] = []
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Call update_callback after every update cycle; returns a remove callback.
+
+        Cycles run even when the coordinator skips its listeners for unchanged data.
+        """
+        self._listeners.append(update_callback)
+
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return an aiohttp trace config feeding the DNS and connect histograms."""
+        trace = aiohttp.TraceConfig(trace_config_ctx_factory=lambda trace_request_ctx: SimpleNamespace())
+
+        async def on_dns_start(session, ctx, params):
+            ctx.dns_start = time.monotonic()
+
+        async def on_dns_end(session, ctx, params):
+            if getattr(ctx, "dns_start", None) is not None:
+                self.latency["dns"].observe((time.monotonic() - ctx.dns_start) * 1000)
+
+        async def on_connect_start(session, ctx, params):
+            ctx.connect_start = time.monotonic()
+
+        async def on_connect_end(session, ctx, params):
+            if getattr(ctx, "connect_start", None) is not None:
+                self.latency["connect"].observe((time.monotonic() - ctx.connect_start) * 1000)
+
+        trace.on_dns_resolvehost_start.append(on_dns_start)
+        trace.on_dns_resolvehost_end.append(on_dns_end)
+        trace.on_connection_create_start.append(on_connect_start)
+        trace.on_connection_create_end.append(on_connect_end)
+        return trace
+
+    def start_cycle(self) -> None:
+        """Mark the start of a coordinator update cycle."""
+        self._cycle_start = time.monotonic()
+        self._cycle = {"requests": 0, "bytes": 0, "errors": 0, "not_modified": 0, "path": None}
+
+    def record_request(
+        self,
+        elapsed: float,
+        nbytes: int,
+        error_type: str | None = None,
+        not_modified: bool = False,
+        decoded: int | None = None,
+    ) -> None:
+        """Record one HTTP request; elapsed is in seconds.
+
+        nbytes is the size on the wire and decoded the size after decompression.
+        """
+        self.latency["request"].observe(elapsed * 1000)
+        self.requests_total += 1
+        self.bytes_received += nbytes
+        self.bytes_decoded += nbytes if decoded is None else decoded
+        if not_modified:
+            self.not_modified += 1
+            if self._cycle is not None:
+                self._cycle["not_modified"] += 1
+        if error_type is not None:
+            self.errors[error_type] += 1
+        if self._cycle is not None:
+            self._cycle["requests"] += 1
+            self._cycle["bytes"] += nbytes
+            if error_type is not None:
+                self._cycle["errors"] += 1
+
+    def set_path(self, path: str) -> None:
+        """Record which fetch path the current cycle took."""
+        if self._cycle is not None:
+            self._cycle["path"] = path
+
+    def end_cycle(self, success: bool) -> None:
+        """Close the current cycle and keep it as the last cycle."""
+        if self._cycle is None:
+            return
+        elapsed_ms = (time.monotonic() - self._cycle_start) * 1000
+        self.latency["cycle"].observe(elapsed_ms)
+        self.cycles += 1
+        if self._cycle["path"] is not None:
+            self.paths[self._cycle["path"]] += 1
+        self.last_cycle = {**self._cycle, "success": success, "duration_ms": round(elapsed_ms, 1)}
+        self._cycle = None
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @property
+    def error_count(self) -> int:
+        """Return the total number of failed requests."""
+        return sum(self.errors.values())
+
+    def as_dict(self) -> dict:
+        """Return a JSON serialisable snapshot for diagnostics."""
+        return {
+            "latency": {name: hist.as_dict() for name, hist in self.latency.items()},
+            "bytes_received": self.bytes_received,
+            "bytes_decoded": self.bytes_decoded,
+            "requests_total": self.requests_total,
+            "not_modified": self.not_modified,
+            "cycles": self.cycles,
+            "requests_per_cycle": round(self.requests_total / self.cycles, 2) if self.cycles else None,
+            "paths": dict(self.paths),
+            "errors": dict(self.errors),
+            "last_cycle": self.last_cycle,
+        }
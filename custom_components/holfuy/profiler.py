@@ -0,0 +1,192 @@
+"""On-demand profiling of Holfuy update cycles."""
+import cProfile
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stages reported in the timing breakdown, in pipeline order
+STAGES = ("url_build", "fetch", "json_decode", "parse", "repairs", "entity_writes")
+
+PROFILE_DIR = "holfuy_profiles"
+
+
+def stage(profiler: "CycleProfiler | None", name: str):
+    """Return a context manager timing a stage, or a no-op when not profiling."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+class CycleProfiler:
+    """Profile the next N update cycles of one config entry.
+
+    Runs cProfile while a cycle is in flight and accumulates wall-clock time per
+    stage. Stage totals are summed over requests, so parallel fallback fetches can
+    add up to more than the cycle duration. Other tasks running on the event loop
+    during a cycle also show up in the cProfile output.
+
+    Python allows only one active profiler per process, so only one entry can be
+    profiled at a time.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, cycles: int, coordinator):
+        self._hass = hass
+        self._entry_id = entry_id
+        self._coordinator = coordinator
+        self._profile = cProfile.Profile()
+        self._remaining = cycles
+        self._current = None
+        self._cycle_start = None
+        self._finishing = False
+        self._original_update = None
+        self.cycles = []
+
+    @property
+    def active(self) -> bool:
+        """Return True while cycles remain to be profiled."""
+        return self._remaining > 0
+
+    def _enable(self) -> bool:
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            # Another profiler (e.g. the profiler integration) is running
+            _LOGGER.warning("Cannot profile Holfuy entry %s: %s", self._entry_id, err)
+            return False
+        return True
+
+    def attach(self) -> None:
+        """Start timing entity writes and watching for the end of refreshes."""
+        original_listeners = self._coordinator.async_update_listeners
+        original_update = self._coordinator.update_method
+
+        def timed_update_listeners():
+            enabled = self._enable()
+            try:
+                with self.stage("entity_writes"):
+                    original_listeners()
+            finally:
+                if enabled:
+                    self._profile.disable()
+
+        async def watched_update(**kwargs):
+            try:
+                return await original_update(**kwargs)
+            finally:
+                if not self.active and not self._finishing:
+                    self._finishing = True
+                    # The coordinator dispatches listeners synchronously once this returns,
+                    # so a callback queued now runs after the last cycle's entity writes
+                    self._hass.loop.call_soon(self._start_finish)
+
+        self._original_update = original_update
+        self._coordinator.async_update_listeners = timed_update_listeners
+        self._coordinator.update_method = watched_update
+
+    def detach(self) -> None:
+        """Restore the coordinator's own listener dispatch and update method."""
+        self._coordinator.__dict__.pop("async_update_listeners", None)
+        if self._original_update is not None:
+            self._coordinator.update_method = self._original_update
+            self._original_update = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Accumulate the wall-clock time of the wrapped block under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Entity writes run after the cycle has closed, so fall back to the last cycle
+            target = self._current if self._current is not None else (self.cycles[-1] if self.cycles else None)
+            if target is not None:
+                target["stages_ms"][name] += (time.perf_counter() - start) * 1000
+
+    def start_cycle(self) -> None:
+        """Begin profiling an update cycle."""
+        if not self._enable():
+            # Give up rather than retry every poll; the artifacts are written for cycles done so far
+            self._remaining = 0
+            return
+        self._current = {"stages_ms": defaultdict(float)}
+        self._cycle_start = time.perf_counter()
+
+    def end_cycle(self, success: bool) -> None:
+        """Finish the current cycle."""
+        if self._current is None:
+            return
+        self._profile.disable()
+        self._current["duration_ms"] = (time.perf_counter() - self._cycle_start) * 1000
+        self._current["success"] = success
+        self.cycles.append(self._current)
+        self._current = None
+        self._remaining -= 1
+
+    def summary(self) -> dict:
+        """Return the per-cycle and total stage breakdown."""
+        totals = dict.fromkeys(STAGES, 0.0)
+        cycles = []
+        for cycle in self.cycles:
+            stages = {name: round(cycle["stages_ms"].get(name, 0.0), 3) for name in STAGES}
+            for name, value in stages.items():
+                totals[name] += value
+            cycles.append(
+                {
+                    "duration_ms": round(cycle["duration_ms"], 3),
+                    "success": cycle["success"],
+                    "stages_ms": stages,
+                }
+            )
+        return {
+            "entry_id": self._entry_id,
+            "cycles": cycles,
+            "totals_ms": {name: round(value, 3) for name, value in totals.items()},
+        }
+
+    def _start_finish(self) -> None:
+        self._hass.async_create_task(self._async_finish())
+
+    async def _async_finish(self) -> None:
+        """Detach from the coordinator and write the profile artifacts."""
+        self.detach()
+        if not self.cycles:
+            self._release()
+            return
+        summary = self.summary()
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = self._hass.config.path(PROFILE_DIR, f"{self._entry_id}_{stamp}")
+
+        def _write():
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            self._profile.dump_stats(f"{base}.prof")
+            with open(f"{base}.json", "w", encoding="utf-8") as fh:
+                json.dump(summary, fh, indent=2)
+
+        try:
+            await self._hass.async_add_executor_job(_write)
+        except OSError as err:
+            _LOGGER.error("Failed to write Holfuy profile for entry %s: %s", self._entry_id, err)
+            return
+        finally:
+            self._release()
+
+        _LOGGER.info(
+            "Holfuy profile for entry %s written to %s.prof (stage totals: %s)",
+            self._entry_id,
+            base,
+            summary["totals_ms"],
+        )
+
+    def _release(self) -> None:
+        """Clear this profiler from the entry so another profile can be started."""
+        entry_data = self._hass.data.get(DOMAIN, {}).get(self._entry_id)
+        if entry_data is not None and entry_data.get("profiler") is self:
+            entry_data["profiler"] = None
@@ -0,0 +1,45 @@
+"""Single-flight manual refresh with a freshness TTL."""
+import asyncio
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import TimestampDataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+
+class RefreshGate:
+    """Coalesce manual refresh requests (service calls, update_entity) for one entry.
+
+    Requests join a refresh that is already running, and are answered from the
+    coordinator's data when the last successful update is younger than the TTL, so
+    a burst of requests causes at most one upstream poll.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: TimestampDataUpdateCoordinator, ttl: timedelta):
+        self._hass = hass
+        self._coordinator = coordinator
+        self._ttl = ttl
+        self._inflight: asyncio.Task | None = None
+
+    def is_fresh(self) -> bool:
+        """Return True when the current data is younger than the TTL."""
+        last = self._coordinator.last_update_success_time
+        return (
+            self._coordinator.last_update_success
+            and last is not None
+            and dt_util.utcnow() - last < self._ttl
+        )
+
+    async def async_refresh(self, force: bool = False) -> None:
+        """Refresh unless fresh (or forced), joining any refresh in flight."""
+        if self._inflight is None:
+            if not force and self.is_fresh():
+                return
+            self._inflight = self._hass.async_create_task(self._coordinator.async_refresh())
+            self._inflight.add_done_callback(self._clear)
+        # Shielded so one cancelled caller does not cancel the refresh for the others
+        await asyncio.shield(self._inflight)
+
+    def _clear(self, task: asyncio.Task) -> None:
+        if self._inflight is task:
+            self._inflight = None
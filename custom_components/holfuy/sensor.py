@@ -1,3 +1,5 @@
+import time
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -6,8 +8,13 @@ from homeassistant.components.sensor import (
 from homeassistant.const import (
     UnitOfSpeed,
     UnitOfTemperature,
+    UnitOfTime,
+    UnitOfInformation,
     DEGREE,
+    EntityCategory,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import (
     DOMAIN,
@@ -15,6 +22,12 @@ from .const import (
     CONF_TEMP_UNIT,
     DEFAULT_WIND_UNIT,
     DEFAULT_TEMP_UNIT,
+    CONF_DEADBAND_WIND,
+    CONF_DEADBAND_DIRECTION,
+    CONF_DEADBAND_TEMP,
+    CONF_MAX_SILENCE,
+    DEFAULT_DEADBAND,
+    DEFAULT_MAX_SILENCE,
 )
 
 SENSOR_TYPES = {
@@ -22,27 +35,33 @@ SENSOR_TYPES = {
         "name": "Wind Speed",
         "state_class": SensorStateClass.MEASUREMENT,
         "icon": "mdi:weather-windy",
+        "deadband": CONF_DEADBAND_WIND,
     },
     "wind_gust": {
         "name": "Wind Gust",
         "state_class": SensorStateClass.MEASUREMENT,
         "icon": "mdi:weather-windy",
+        "deadband": CONF_DEADBAND_WIND,
     },
     "wind_min": {
         "name": "Wind Min",
         "state_class": SensorStateClass.MEASUREMENT,
         "icon": "mdi:weather-windy",
+        "deadband": CONF_DEADBAND_WIND,
     },
     "wind_direction": {
         "name": "Wind Direction",
         "state_class": SensorStateClass.MEASUREMENT,
         "icon": "mdi:compass",
+        "deadband": CONF_DEADBAND_DIRECTION,
+        "circular": True,
     },
     "temperature": {
         "name": "Temperature",
         "device_class": SensorDeviceClass.TEMPERATURE,
         "state_class": SensorStateClass.MEASUREMENT,
         "icon": "mdi:thermometer",
+        "deadband": CONF_DEADBAND_TEMP,
     },
 }
 
@@ -59,12 +78,57 @@ TEMP_UNIT_MAP = {
     "F": UnitOfTemperature.FAHRENHEIT,
 }
 
+# Diagnostic sensors backed by the entry's HolfuyMetrics (only created when metrics are enabled)
+METRIC_SENSOR_TYPES = {
+    "poll_latency": {
+        "name": "Poll Latency",
+        "unit": UnitOfTime.MILLISECONDS,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "icon": "mdi:timer-outline",
+        "value": lambda m: m.last_cycle["duration_ms"] if m.last_cycle else None,
+    },
+    "request_latency": {
+        "name": "Request Latency",
+        "unit": UnitOfTime.MILLISECONDS,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "icon": "mdi:timer-outline",
+        "value": lambda m: round(m.latency["request"].last_ms, 1) if m.latency["request"].last_ms is not None else None,
+    },
+    "requests_per_cycle": {
+        "name": "Requests Per Cycle",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "icon": "mdi:counter",
+        "value": lambda m: m.last_cycle["requests"] if m.last_cycle else None,
+    },
+    "bytes_received": {
+        "name": "Bytes Received",
+        "unit": UnitOfInformation.BYTES,
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "icon": "mdi:download-network",
+        "value": lambda m: m.bytes_received,
+    },
+    "request_errors": {
+        "name": "Request Errors",
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "icon": "mdi:alert-circle-outline",
+        "value": lambda m: m.error_count,
+        "attributes": lambda m: dict(m.errors),
+    },
+    "fetch_path": {
+        "name": "Fetch Path",
+        "icon": "mdi:call-split",
+        "value": lambda m: m.last_cycle["path"] if m.last_cycle else None,
+        "attributes": lambda m: dict(m.paths),
+    },
+}
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Holfuy sensors from a config entry."""
     entry_data = hass.data[DOMAIN][entry.entry_id]
     coordinator = entry_data["coordinator"]
     stations = entry_data["stations"]
+    refresh = entry_data["refresh"]
 
     sensors = []
 
@@ -76,6 +140,9 @@ async def async_setup_entry(hass, entry, async_add_entities):
     wind_unit = WIND_UNIT_MAP.get(su, UnitOfSpeed.METERS_PER_SECOND)
     temp_unit = TEMP_UNIT_MAP.get(tu, UnitOfTemperature.CELSIUS)
 
+    # Recorder footprint filtering; 0 deadband keeps the default write-on-every-update behaviour
+    max_silence = entry.data.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE) * 60
+
     for station in stations:
         for key, sensor_config in SENSOR_TYPES.items():
             if key == "temperature":
@@ -86,7 +153,37 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 unit = DEGREE
             else:
                 unit = None
-            sensors.append(HolfuySensor(coordinator, key, sensor_config, unit, station))
+            deadband = entry.data.get(sensor_config["deadband"], DEFAULT_DEADBAND)
+            sensors.append(
+                HolfuySensor(coordinator, key, sensor_config, unit, station, deadband, max_silence, refresh)
+            )
+
+    # Virtual station gets the same sensor set as a real one
+    virtual_station = entry_data.get("virtual")
+    if virtual_station is not None:
+        for key, sensor_config in SENSOR_TYPES.items():
+            if key == "temperature":
+                unit = temp_unit
+            elif key == "wind_direction":
+                unit = DEGREE
+            else:
+                unit = wind_unit
+            deadband = entry.data.get(sensor_config["deadband"], DEFAULT_DEADBAND)
+            sensors.append(
+                HolfuySensor(coordinator, key, sensor_config, unit, virtual_station, deadband, max_silence, refresh)
+            )
+
+    wind_rose = entry_data.get("wind_rose")
+    if wind_rose is not None:
+        rose_stations = [*stations, virtual_station] if virtual_station is not None else stations
+        for station in rose_stations:
+            for hours in wind_rose.windows_hours:
+                sensors.append(HolfuyWindRoseSensor(coordinator, wind_rose, station, hours))
+
+    metrics = entry_data.get("metrics")
+    if metrics is not None:
+        for key, sensor_config in METRIC_SENSOR_TYPES.items():
+            sensors.append(HolfuyMetricSensor(metrics, key, sensor_config, entry.entry_id))
 
     async_add_entities(sensors)
 
@@ -95,10 +192,21 @@ class HolfuySensor(CoordinatorEntity, SensorEntity):
     """Representation of a Holfuy sensor."""
 
     _attr_has_entity_name = True
+    # Static or per-poll attributes that only bloat the recorder
+    _unrecorded_attributes = frozenset({"station_name", "last_update"})
 
-    def __init__(self, coordinator, key, sensor_config, unit, station_id):
+    def __init__(
+        self, coordinator, key, sensor_config, unit, station_id, deadband=0.0, max_silence=0, refresh=None
+    ):
         """Initialize the sensor."""
         super().__init__(coordinator)
+        self._refresh = refresh
+        self._deadband = deadband
+        self._circular = sensor_config.get("circular", False)
+        self._max_silence = max_silence
+        self._written_value = None
+        self._written_available = None
+        self._written_at = None
         self._key = key
         self._sensor_config = sensor_config
         self._station_id = str(station_id)
@@ -113,6 +221,42 @@ class HolfuySensor(CoordinatorEntity, SensorEntity):
         # Set the native unit - this is what the API returns in
         self._attr_native_unit_of_measurement = unit
 
+    async def async_update(self):
+        """Serve homeassistant.update_entity through the entry's single-flight refresh gate."""
+        if self._refresh is None:
+            await super().async_update()
+            return
+        await self._refresh.async_refresh()
+
+    def _should_write_state(self, value, now):
+        """Return True when value differs enough from the last written state."""
+        available = self.available
+        if self._written_at is None or available != self._written_available:
+            return True
+        if self._max_silence and now - self._written_at >= self._max_silence:
+            return True
+        if value is None or self._written_value is None:
+            return value != self._written_value
+        diff = abs(value - self._written_value)
+        if self._circular:
+            diff = min(diff, 360 - diff)
+        return diff > self._deadband
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only for changes outside the deadband (or after max silence)."""
+        if self._deadband <= 0:
+            super()._handle_coordinator_update()
+            return
+        value = self.native_value
+        now = time.monotonic()
+        if not self._should_write_state(value, now):
+            return
+        self._written_value = value
+        self._written_available = self.available
+        self._written_at = now
+        self.async_write_ha_state()
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -190,4 +334,90 @@ class HolfuySensor(CoordinatorEntity, SensorEntity):
             "name": station_name,
             "manufacturer": "Holfuy",
             "model": "Weather Station",
+        }
+
+
+class HolfuyWindRoseSensor(CoordinatorEntity, SensorEntity):
+    """Wind rose for one station and window; state is the dominant direction sector."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:compass-rose"
+    # The histogram is served as attributes for cards, not kept in the database
+    _unrecorded_attributes = frozenset({"sectors", "speed_bins", "speed_unit", "samples", "counts"})
+
+    def __init__(self, coordinator, wind_rose, station_id, hours):
+        """Initialize the wind rose sensor."""
+        super().__init__(coordinator)
+        self._wind_rose = wind_rose
+        self._station_id = str(station_id)
+        self._hours = hours
+        self._attr_unique_id = f"{DOMAIN}_{self._station_id}_wind_rose_{hours}h"
+        self._attr_name = f"Wind Rose {hours}h"
+
+    @property
+    def native_value(self):
+        """Return the sector the wind blew from most often."""
+        rose = self._wind_rose.get(self._station_id, self._hours)
+        return rose.dominant_sector() if rose is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the sector x speed-bin counts."""
+        rose = self._wind_rose.get(self._station_id, self._hours)
+        return rose.as_dict() if rose is not None else {}
+
+    @property
+    def device_info(self):
+        """Attach to the station's device."""
+        return {"identifiers": {(DOMAIN, self._station_id)}}
+
+
+class HolfuyMetricSensor(SensorEntity):
+    """Diagnostic sensor exposing request/cycle metrics for a config entry.
+
+    Updated from the metrics after every cycle rather than from the coordinator,
+    which skips its listeners when a poll returns unchanged data.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(self, metrics, key, sensor_config, entry_id):
+        """Initialize the diagnostic sensor."""
+        self._metrics = metrics
+        self._key = key
+        self._sensor_config = sensor_config
+        self._entry_id = entry_id
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{key}"
+        self._attr_name = sensor_config["name"]
+        self._attr_icon = sensor_config.get("icon")
+        self._attr_state_class = sensor_config.get("state_class")
+        self._attr_native_unit_of_measurement = sensor_config.get("unit")
+
+    async def async_added_to_hass(self):
+        """Write state after every update cycle."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._metrics.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self):
+        """Return the current metric value."""
+        return self._sensor_config["value"](self._metrics)
+
+    @property
+    def extra_state_attributes(self):
+        """Return metric breakdowns where available."""
+        attributes = self._sensor_config.get("attributes")
+        return attributes(self._metrics) if attributes else None
+
+    @property
+    def device_info(self):
+        """Group diagnostic sensors under a per-entry service device."""
+        return {
+            "identifiers": {(DOMAIN, self._entry_id)},
+            "name": "Holfuy API",
+            "manufacturer": "Holfuy",
+            "model": "API Client",
+            "entry_type": DeviceEntryType.SERVICE,
         }
\ No newline at end of file
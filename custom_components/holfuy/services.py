@@ -0,0 +1,150 @@
+"""Service handlers for Holfuy integration."""
+import asyncio
+import logging
+import os
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import DOMAIN
+from .profiler import CycleProfiler
+from .traffic import RECORDING_DIR, async_replay
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+SERVICE_REPLAY = "replay"
+SERVICE_REFRESH = "refresh"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_CYCLES = "cycles"
+ATTR_FILE = "file"
+ATTR_REALTIME = "realtime"
+ATTR_FORCE = "force"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_REALTIME, default=False): cv.boolean,
+    }
+)
+
+
+def _get_entries(hass: HomeAssistant, call: ServiceCall) -> dict:
+    """Return the loaded entries targeted by a service call."""
+    loaded = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_ENTRY_ID)
+    if entry_id is None:
+        return loaded
+    if entry_id not in loaded:
+        raise ServiceValidationError(f"Holfuy entry {entry_id} is not loaded")
+    return {entry_id: loaded[entry_id]}
+
+
+async def _async_handle_profile(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Arm a profiler for the next N update cycles of one entry."""
+    # Python allows a single active cProfile per process, so entries are profiled one at a time
+    for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+        if entry_data.get("profiler") is not None:
+            raise ServiceValidationError(f"Holfuy entry {entry_id} is already being profiled")
+    entries = _get_entries(hass, call)
+    if len(entries) != 1:
+        raise ServiceValidationError("Several Holfuy entries are loaded, select the one to profile")
+
+    cycles = call.data[ATTR_CYCLES]
+    entry_id, entry_data = next(iter(entries.items()))
+    profiler = CycleProfiler(hass, entry_id, cycles, entry_data["coordinator"])
+    profiler.attach()
+    entry_data["profiler"] = profiler
+    _LOGGER.info("Profiling the next %d update cycle(s) of Holfuy entry %s", cycles, entry_id)
+
+
+async def _async_handle_refresh(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Refresh the targeted entries, joining in-flight polls and honouring the TTL."""
+    entries = _get_entries(hass, call)
+    await asyncio.gather(
+        *(entry_data["refresh"].async_refresh(call.data[ATTR_FORCE]) for entry_data in entries.values())
+    )
+    if not call.return_response:
+        return None
+    return {entry_id: entry_data["coordinator"].data or {} for entry_id, entry_data in entries.items()}
+
+
+def _is_recording_path(hass: HomeAssistant, path: str) -> bool:
+    """Return True when path is inside the integration's recording folder."""
+    recordings = os.path.realpath(hass.config.path(RECORDING_DIR))
+    return os.path.commonpath([os.path.realpath(path), recordings]) == recordings
+
+
+async def _async_handle_replay(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Replay a traffic recording through an entry's update pipeline in the background."""
+    entry_id, entry_data = next(iter(_get_entries(hass, call).items()))
+    path = call.data.get(ATTR_FILE) or hass.config.path(RECORDING_DIR, f"{entry_id}.jsonl")
+    if not os.path.isabs(path):
+        path = hass.config.path(path)
+    # The integration's own recordings are always readable; other files must be allowlisted
+    if not _is_recording_path(hass, path) and not hass.config.is_allowed_path(path):
+        raise ServiceValidationError(
+            f"Access to {path} is not allowed, add its folder to allowlist_external_dirs"
+        )
+
+    hass.async_create_background_task(
+        async_replay(hass, entry_data["coordinator"], entry_data["replay"](), path, call.data[ATTR_REALTIME]),
+        f"{DOMAIN}_replay_{entry_id}",
+    )
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register Holfuy services once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def handle_profile(call: ServiceCall) -> None:
+        await _async_handle_profile(hass, call)
+
+    async def handle_replay(call: ServiceCall) -> None:
+        await _async_handle_replay(hass, call)
+
+    async def handle_refresh(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_refresh(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, handle_profile, schema=PROFILE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_REPLAY, handle_replay, schema=REPLAY_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        handle_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove Holfuy services when the last entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+    hass.services.async_remove(DOMAIN, SERVICE_REPLAY)
+    hass.services.async_remove(DOMAIN, SERVICE_REFRESH)
@@ -0,0 +1,262 @@
+"""Record and replay raw Holfuy API traffic for offline debugging."""
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import uuid
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDING_DIR = "holfuy_recordings"
+
+_API_KEY_RE = re.compile(r"(pw=)[^&]*")
+
+
+def _redact_url(url: str) -> str:
+    """Strip the API key from a request URL before it is written to disk."""
+    return _API_KEY_RE.sub(r"\1REDACTED", str(url))
+
+
+class ReplayedData(dict):
+    """Coordinator data fed in by a replay.
+
+    Entities render it like live data; listeners with side effects (history, export,
+    wind rose) check for this type and skip replayed readings.
+    """
+
+
+class TrafficRecorder:
+    """Append raw API responses to a JSONL file, one line per request.
+
+    Lines are buffered during a cycle and flushed in the executor once the cycle's
+    session closes, so the event loop never waits on disk I/O. Cycle numbers restart
+    with every recorder, so each line also carries a run id unique to the recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str):
+        self._hass = hass
+        self.path = path
+        self.run = uuid.uuid4().hex[:12]
+        self._cycle = 0
+        self._pending = []
+
+    def next_cycle(self) -> int:
+        """Return the id of a new update cycle."""
+        self._cycle += 1
+        return self._cycle
+
+    def record(self, cycle: int, url: str, started: float, elapsed: float, **fields) -> None:
+        """Buffer one request record."""
+        self._pending.append(
+            json.dumps(
+                {
+                    "ts": round(started, 3),
+                    "run": self.run,
+                    "cycle": cycle,
+                    "url": _redact_url(url),
+                    "latency_ms": round(elapsed * 1000, 1),
+                    **fields,
+                },
+                separators=(",", ":"),
+            )
+        )
+
+    async def async_flush(self) -> None:
+        """Append buffered records to the recording file."""
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+
+        def _append():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write("\n".join(lines) + "\n")
+
+        try:
+            await self._hass.async_add_executor_job(_append)
+        except OSError as err:
+            _LOGGER.warning("Failed to write Holfuy traffic recording %s: %s", self.path, err)
+
+
+class RecordingSession:
+    """Wrap an aiohttp session and record every response it returns."""
+
+    def __init__(self, session: aiohttp.ClientSession, recorder: TrafficRecorder):
+        self._session = session
+        self._recorder = recorder
+        self._cycle = recorder.next_cycle()
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        try:
+            await self._recorder.async_flush()
+        finally:
+            await self._session.__aexit__(*exc_info)
+
+    async def get(self, url: str, **kwargs):
+        """Perform the request, buffer the body and record it."""
+        started = time.time()
+        start = time.monotonic()
+        try:
+            resp = await self._session.get(url, **kwargs)
+            body = await resp.read()
+        except asyncio.CancelledError:
+            # The caller's timeout cancels the request
+            self._recorder.record(self._cycle, url, started, time.monotonic() - start, error="timeout")
+            raise
+        except aiohttp.ClientError as err:
+            self._recorder.record(
+                self._cycle, url, started, time.monotonic() - start, error="connection", message=str(err)
+            )
+            raise
+        self._recorder.record(
+            self._cycle,
+            url,
+            started,
+            time.monotonic() - start,
+            status=resp.status,
+            reason=resp.reason,
+            content_type=resp.content_type,
+            content_length=resp.content_length,
+            etag=resp.headers.get("ETag"),
+            body=body.decode("utf-8", errors="replace"),
+        )
+        return resp
+
+
+class ReplayResponse:
+    """Minimal stand-in for aiohttp.ClientResponse built from a recorded line."""
+
+    def __init__(self, url: str, record: dict):
+        self._url = URL(url)
+        self.status = record.get("status", 200)
+        self.reason = record.get("reason") or ""
+        self.content_type = record.get("content_type") or "application/json"
+        self.content_length = record.get("content_length")
+        self._body = (record.get("body") or "").encode("utf-8")
+        self.headers = {"ETag": record["etag"]} if record.get("etag") else {}
+
+    @property
+    def request_info(self) -> aiohttp.RequestInfo:
+        return aiohttp.RequestInfo(self._url, "GET", CIMultiDictProxy(CIMultiDict()), self._url)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                self.request_info, (), status=self.status, message=self.reason
+            )
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self):
+        if "json" not in self.content_type:
+            raise aiohttp.ContentTypeError(
+                self.request_info,
+                (),
+                status=self.status,
+                message=f"Attempt to decode JSON with unexpected mimetype: {self.content_type}",
+            )
+        return json.loads(self._body) if self._body else None
+
+
+class ReplaySession:
+    """Serve one recorded cycle in place of an aiohttp session."""
+
+    def __init__(self, records: list[dict], realtime: bool):
+        self._records = list(records)
+        self._realtime = realtime
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def _take(self, url: str) -> dict | None:
+        redacted = _redact_url(url)
+        for index, record in enumerate(self._records):
+            if record.get("url") == redacted:
+                return self._records.pop(index)
+        return self._records.pop(0) if self._records else None
+
+    async def get(self, url: str, **kwargs):
+        """Return the next recorded response matching the URL."""
+        record = self._take(url)
+        if record is None:
+            raise aiohttp.ClientConnectionError(f"No recorded response for {_redact_url(url)}")
+        if self._realtime and record.get("latency_ms"):
+            await asyncio.sleep(record["latency_ms"] / 1000)
+        error = record.get("error")
+        if error == "timeout":
+            raise TimeoutError
+        if error is not None:
+            raise aiohttp.ClientConnectionError(record.get("message") or error)
+        return ReplayResponse(url, record)
+
+
+def load_recording(path: str) -> list[list[dict]]:
+    """Read a recording file and group its records by (run, cycle), in file order."""
+    cycles: dict[tuple, list[dict]] = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                _LOGGER.warning("Skipping malformed line in Holfuy recording %s", path)
+                continue
+            cycles.setdefault((record.get("run"), record.get("cycle", 0)), []).append(record)
+    return list(cycles.values())
+
+
+async def async_replay(hass: HomeAssistant, coordinator, update_method, path: str, realtime: bool) -> None:
+    """Feed a recording through a replay update method and the coordinator's entities.
+
+    update_method is a replay instance with its own state, so recorded failures do not
+    create repair issues or throttle the live coordinator. Replayed data is dispatched
+    as ReplayedData without marking a successful update, so the refresh TTL and poll
+    schedule are untouched, and a live refresh afterwards puts the current readings back.
+    """
+    try:
+        cycles = await hass.async_add_executor_job(load_recording, path)
+    except OSError as err:
+        _LOGGER.error("Cannot read Holfuy recording %s: %s", path, err)
+        return
+
+    _LOGGER.info("Replaying %d recorded cycle(s) from %s", len(cycles), path)
+    previous_ts = None
+    start = time.monotonic()
+    for records in cycles:
+        cycle_ts = records[0].get("ts")
+        if realtime and previous_ts is not None and cycle_ts is not None:
+            await asyncio.sleep(max(0.0, cycle_ts - previous_ts))
+        previous_ts = cycle_ts
+        try:
+            data = await update_method(session=ReplaySession(records, realtime))
+        except UpdateFailed as err:
+            _LOGGER.info("Replayed cycle failed: %s", err)
+            continue
+        coordinator.data = ReplayedData(data)
+        coordinator.async_update_listeners()
+    _LOGGER.info("Finished replaying %s in %.2fs", path, time.monotonic() - start)
+    await coordinator.async_refresh()
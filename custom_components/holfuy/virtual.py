@@ -0,0 +1,125 @@
+"""Virtual station interpolated from nearby member stations."""
+import copy
+import math
+import time
+from array import array
+
+from .catalog import haversine_km
+
+VIRTUAL_STATION_PREFIX = "virtual"
+
+# Inverse-distance weighting power
+IDW_POWER = 2
+# Members closer than this are used exclusively (avoids a division by ~0)
+EXACT_MATCH_KM = 0.01
+# Members whose dateTime has not advanced for this long are left out
+STALE_AFTER = 20 * 60
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class VirtualStation:
+    """Inverse-distance-weighted wind vector and temperature from member stations.
+
+    Weights are precomputed once from the member coordinates. Each coordinator
+    update gathers the members' readings into arrays and combines them in one
+    pass; wind speed and direction are averaged as u/v vector components.
+    """
+
+    def __init__(self, entry_id: str, latitude: float, longitude: float, members: dict[str, tuple[float, float]]):
+        self.station_id = f"{VIRTUAL_STATION_PREFIX}_{entry_id}"
+        self.members = list(members)
+        distances = [haversine_km(latitude, longitude, lat, lon) for lat, lon in members.values()]
+        exact = [d <= EXACT_MATCH_KM for d in distances]
+        if any(exact):
+            self._weights = array("d", (1.0 if e else 0.0 for e in exact))
+        else:
+            self._weights = array("d", (1.0 / d**IDW_POWER for d in distances))
+        self._last_seen: dict[str, tuple[object, float]] = {}
+
+    def clone(self) -> "VirtualStation":
+        """Return a copy sharing the weights but tracking staleness on its own."""
+        other = copy.copy(self)
+        other._last_seen = {}
+        return other
+
+    def _fresh(self, station_id: str, station_data: dict, now: float) -> bool:
+        """Track when a member's dateTime last advanced and report whether it is fresh."""
+        stamp = station_data.get("dateTime")
+        seen = self._last_seen.get(station_id)
+        if seen is None or seen[0] != stamp:
+            self._last_seen[station_id] = (stamp, now)
+            return True
+        return now - seen[1] < STALE_AFTER
+
+    def compute(self, data: dict) -> dict | None:
+        """Return station data in the API's shape, or None when no member is usable."""
+        now = time.monotonic()
+        count = len(self.members)
+        weights = array("d", bytes(8 * count))
+        speed = array("d", bytes(8 * count))
+        gust = array("d", bytes(8 * count))
+        wind_min = array("d", bytes(8 * count))
+        direction = array("d", bytes(8 * count))
+        temp = array("d", bytes(8 * count))
+        temp_weights = array("d", bytes(8 * count))
+        used = []
+        latest = None
+
+        for i, station_id in enumerate(self.members):
+            station_data = data.get(station_id)
+            if not isinstance(station_data, dict) or not self._fresh(station_id, station_data, now):
+                continue
+            wind = station_data.get("wind") if isinstance(station_data.get("wind"), dict) else {}
+            s = _number(wind.get("speed"))
+            d = _number(wind.get("direction"))
+            t = _number(station_data.get("temperature"))
+            if s is not None and d is not None:
+                weights[i] = self._weights[i]
+                speed[i] = s
+                direction[i] = math.radians(d)
+                g = _number(wind.get("gust"))
+                m = _number(wind.get("min"))
+                gust[i] = g if g is not None else s
+                wind_min[i] = m if m is not None else s
+            if t is not None:
+                temp_weights[i] = self._weights[i]
+                temp[i] = t
+            if weights[i] or temp_weights[i]:
+                used.append(station_id)
+                stamp = station_data.get("dateTime")
+                if stamp is not None and (latest is None or str(stamp) > str(latest)):
+                    latest = stamp
+
+        if not used:
+            return None
+
+        result = {
+            "stationName": "Holfuy Virtual Station",
+            "dateTime": latest,
+            "members": used,
+        }
+
+        total = sum(weights)
+        if total > 0:
+            u = sum(w * s * math.sin(a) for w, s, a in zip(weights, speed, direction)) / total
+            v = sum(w * s * math.cos(a) for w, s, a in zip(weights, speed, direction)) / total
+            vector_speed = math.hypot(u, v)
+            scalar_speed = sum(w * s for w, s in zip(weights, speed)) / total
+            # Gust and min have no direction of their own, so scale their weighted means by the
+            # same vector/scalar ratio as the speed; this keeps min <= speed <= gust
+            ratio = vector_speed / scalar_speed if scalar_speed > 0 else 1.0
+            result["wind"] = {
+                "speed": round(vector_speed, 1),
+                "direction": round(math.degrees(math.atan2(u, v))) % 360,
+                "gust": round(ratio * sum(w * g for w, g in zip(weights, gust)) / total, 1),
+                "min": round(ratio * sum(w * m for w, m in zip(weights, wind_min)) / total, 1),
+            }
+
+        temp_total = sum(temp_weights)
+        if temp_total > 0:
+            result["temperature"] = round(sum(w * t for w, t in zip(temp_weights, temp)) / temp_total, 1)
+
+        return result
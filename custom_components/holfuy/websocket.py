@@ -0,0 +1,80 @@
+"""Websocket API serving in-memory station history."""
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+DATA_WEBSOCKET = f"{DOMAIN}_websocket"
+
+
+def _find_history(hass: HomeAssistant, station_id: str):
+    """Return the HistoryStore of the first loaded entry that has the station."""
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        history = entry_data.get("history")
+        if history is not None and station_id in history.stations:
+            return history
+    return None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "holfuy/history",
+        vol.Required("station_id"): str,
+        vol.Optional("since"): vol.Coerce(float),
+        vol.Optional("subscribe", default=False): bool,
+    }
+)
+@callback
+def ws_history(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Return recent history as columnar arrays, optionally streaming new samples."""
+    station_id = str(msg["station_id"])
+    history = _find_history(hass, station_id)
+    if history is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"No history for station {station_id}")
+        return
+
+    columns = history.get(station_id, msg.get("since"))
+    if not msg["subscribe"]:
+        connection.send_result(msg["id"], {"station_id": station_id, "history": columns})
+        return
+
+    @callback
+    def forward_delta(station: str, delta: dict) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], {"station_id": station, "delta": delta}))
+
+    connection.subscriptions[msg["id"]] = history.async_subscribe(station_id, forward_delta)
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"station_id": station_id, "history": columns}))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "holfuy/wind_rose",
+        vol.Required("station_id"): str,
+        vol.Required("hours"): vol.Coerce(int),
+    }
+)
+@callback
+def ws_wind_rose(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Return the wind rose for a station and window."""
+    station_id = str(msg["station_id"])
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        wind_rose = entry_data.get("wind_rose")
+        rose = wind_rose.get(station_id, msg["hours"]) if wind_rose is not None else None
+        if rose is not None:
+            connection.send_result(msg["id"], {"station_id": station_id, "hours": msg["hours"], **rose.as_dict()})
+            return
+    connection.send_error(
+        msg["id"], websocket_api.ERR_NOT_FOUND, f"No {msg['hours']}h wind rose for station {station_id}"
+    )
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register websocket commands once."""
+    if hass.data.get(DATA_WEBSOCKET):
+        return
+    websocket_api.async_register_command(hass, ws_history)
+    websocket_api.async_register_command(hass, ws_wind_rose)
+    hass.data[DATA_WEBSOCKET] = True
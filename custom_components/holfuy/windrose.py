@@ -0,0 +1,172 @@
+"""Wind-rose histograms (direction sector x speed bin) over sliding windows."""
+import time
+from array import array
+from bisect import bisect_right
+
+from homeassistant.core import callback
+
+from .traffic import ReplayedData
+
+SECTORS = ("N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE", "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW")
+SECTOR_WIDTH = 360 / len(SECTORS)
+
+# Speed bin edges in m/s (roughly Beaufort); the last bin is open ended
+SPEED_EDGES_MS = (1, 3, 5, 8, 11, 14)
+SPEED_BINS = tuple(
+    [f"{lo}-{hi}" for lo, hi in zip((0, *SPEED_EDGES_MS), SPEED_EDGES_MS)] + [f">{SPEED_EDGES_MS[-1]}"]
+)
+SPEED_UNIT = "m/s"
+
+# Factors converting the configured wind unit to m/s
+TO_MS = {
+    "m/s": 1.0,
+    "km/h": 1 / 3.6,
+    "mph": 0.44704,
+    "knots": 0.514444,
+}
+
+
+def parse_windows(value: str) -> list[int]:
+    """Parse a comma-separated list of window lengths in hours."""
+    windows = []
+    for part in str(value or "").replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        hours = int(part)
+        if hours <= 0:
+            raise ValueError(part)
+        if hours not in windows:
+            windows.append(hours)
+    return windows
+
+
+def _cell(direction: float, speed_ms: float) -> int:
+    """Return the flat sector x speed-bin index of a sample."""
+    sector = int(((direction % 360) + SECTOR_WIDTH / 2) // SECTOR_WIDTH) % len(SECTORS)
+    return sector * len(SPEED_BINS) + bisect_right(SPEED_EDGES_MS, speed_ms)
+
+
+class WindRose:
+    """Sector x speed-bin counts over a sliding time window.
+
+    Counts live in one flat array updated in O(1) per sample. The samples themselves
+    are kept by the station's StationWindRoses; cursor is the index of the oldest
+    sample still counted here.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.counts = array("I", bytes(4 * len(SECTORS) * len(SPEED_BINS)))
+        self.total = 0
+        self.cursor = 0
+
+    def dominant_sector(self) -> str | None:
+        """Return the sector with the most samples."""
+        if not self.total:
+            return None
+        bins = len(SPEED_BINS)
+        totals = [sum(self.counts[s * bins:(s + 1) * bins]) for s in range(len(SECTORS))]
+        return SECTORS[max(range(len(SECTORS)), key=totals.__getitem__)]
+
+    def as_dict(self) -> dict:
+        """Return the histogram as a JSON serialisable payload."""
+        bins = len(SPEED_BINS)
+        return {
+            "sectors": list(SECTORS),
+            "speed_bins": list(SPEED_BINS),
+            "speed_unit": SPEED_UNIT,
+            "samples": self.total,
+            "counts": [list(self.counts[s * bins:(s + 1) * bins]) for s in range(len(SECTORS))],
+        }
+
+
+class StationWindRoses:
+    """All windows of one station, sharing a single sample log.
+
+    Each sample is stored once, as a timestamp and a one-byte cell in two flat arrays,
+    however many windows there are. Each window expires samples by moving its own
+    cursor forwards; samples every window has passed are compacted away once they make
+    up half of the log, so expiry stays O(1) amortised per sample and window.
+    """
+
+    def __init__(self, windows_hours: list[int]):
+        self.roses = {hours: WindRose(hours * 3600) for hours in windows_hours}
+        self._ts = array("d")
+        self._cells = array("B")
+
+    def add(self, ts: float, direction: float, speed_ms: float) -> None:
+        """Count one sample in every window."""
+        cell = _cell(direction, speed_ms)
+        self._ts.append(ts)
+        self._cells.append(cell)
+        for rose in self.roses.values():
+            rose.counts[cell] += 1
+            rose.total += 1
+
+    def expire(self, now: float) -> None:
+        """Subtract samples that fell out of each window."""
+        end = len(self._ts)
+        for rose in self.roses.values():
+            cutoff = now - rose.window
+            index = rose.cursor
+            while index < end and self._ts[index] < cutoff:
+                rose.counts[self._cells[index]] -= 1
+                rose.total -= 1
+                index += 1
+            rose.cursor = index
+
+        head = min(rose.cursor for rose in self.roses.values())
+        if head and head * 2 >= end:
+            del self._ts[:head]
+            del self._cells[:head]
+            for rose in self.roses.values():
+                rose.cursor -= head
+
+
+class WindRoseStore:
+    """Per-entry wind roses for every station and window, fed from coordinator updates."""
+
+    def __init__(self, coordinator, windows_hours: list[int], wind_unit: str):
+        self._coordinator = coordinator
+        self.windows_hours = windows_hours
+        self._to_ms = TO_MS.get(wind_unit, 1.0)
+        self.stations: dict[str, StationWindRoses] = {}
+        self._last_stamp: dict[str, object] = {}
+
+    def get(self, station_id: str, hours: int) -> WindRose | None:
+        """Return the wind rose for a station and window, expired up to now."""
+        station = self.stations.get(station_id)
+        if station is None or hours not in station.roses:
+            return None
+        station.expire(time.monotonic())
+        return station.roses[hours]
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Add one sample per station whose dateTime advanced."""
+        data = self._coordinator.data
+        # Replayed readings are old and would be counted as current samples
+        if not isinstance(data, dict) or isinstance(data, ReplayedData):
+            return
+        now = time.monotonic()
+        for station_id, station_data in data.items():
+            if not isinstance(station_data, dict):
+                continue
+            station = self.stations.get(station_id)
+            if station is None:
+                station = self.stations[station_id] = StationWindRoses(self.windows_hours)
+            station.expire(now)
+
+            stamp = station_data.get("dateTime")
+            if stamp is not None and self._last_stamp.get(station_id) == stamp:
+                continue
+            self._last_stamp[station_id] = stamp
+            wind = station_data.get("wind")
+            if not isinstance(wind, dict):
+                continue
+            speed = wind.get("speed")
+            direction = wind.get("direction")
+            if not isinstance(speed, (int, float)) or not isinstance(direction, (int, float)):
+                continue
+            station.add(now, direction, speed * self._to_ms)